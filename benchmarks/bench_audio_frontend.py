@@ -0,0 +1,146 @@
+"""
+Hour-long recordings through the audio front end that feeds the Speech SDK.
+
+Synthesizes a dictation of the given length: noise bursts standing in for
+speech with short pauses, framed by minutes of silence (recorder started
+early, left running after the doctor finished). It is written once as 16 kHz
+mono WAV and once as 44.1 kHz stereo MP3.
+
+Each file is then read two ways, each in a fresh process so peak memory is
+comparable:
+  whole   read the file and decode everything into one buffer, no trimming
+          (what a decode-then-push approach does)
+  stream  PcmStream: chunked decode/resample with silence trimming
+
+Usage:
+    python benchmarks/bench_audio_frontend.py [minutes]
+"""
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import wave
+from array import array
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.audio_input import PcmStream
+
+LEADING_SILENCE_SECONDS = 120
+TRAILING_SILENCE_SECONDS = 180
+
+
+def speech_block(rate: int, channels: int) -> bytes:
+    """Ten seconds of bursty noise with pauses, standing in for speech"""
+    rng = random.Random(7)
+    samples = array("h")
+    for _ in range(10):
+        loud = int(rate * 0.8)
+        samples.extend(int(rng.gauss(0, 4000)) for _ in range(loud) for _ in range(channels))
+        samples.extend([0] * (rate - loud) * channels)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples.tobytes()
+
+
+def iter_recording(rate: int, channels: int, minutes: float):
+    block = speech_block(rate, channels)
+    silence = bytes(rate * channels * 2)
+    for _ in range(LEADING_SILENCE_SECONDS):
+        yield silence
+    speech_seconds = minutes * 60 - LEADING_SILENCE_SECONDS - TRAILING_SILENCE_SECONDS
+    for _ in range(int(speech_seconds // 10)):
+        yield block
+    for _ in range(TRAILING_SILENCE_SECONDS):
+        yield silence
+
+
+def write_wav(path: str, minutes: float):
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        for data in iter_recording(16000, 1, minutes):
+            wav.writeframes(data)
+
+
+def write_mp3(path: str, minutes: float):
+    import av
+
+    rate = 44100
+    with av.open(path, "w", format="mp3") as container:
+        stream = container.add_stream("mp3", rate=rate)
+        stream.layout = "stereo"
+        stream.bit_rate = 128000
+        pts = 0
+        for data in iter_recording(rate, 2, minutes):
+            for start in range(0, len(data), 4 * 4410):
+                piece = data[start:start + 4 * 4410]
+                frame = av.AudioFrame(format="s16", layout="stereo", samples=len(piece) // 4)
+                frame.planes[0].update(piece)
+                frame.rate = rate
+                frame.pts = pts
+                pts += frame.samples
+                for packet in stream.encode(frame):
+                    container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+
+
+def run(mode: str, path: str, results):
+    start = time.perf_counter()
+    if mode == "whole":
+        with open(path, "rb") as f:
+            data = f.read()
+        pcm = PcmStream(data, trim_silence=False)
+        audio = b"".join(pcm)
+        sent = len(audio) / (pcm.sample_rate * pcm.channels * pcm.bits_per_sample // 8)
+        total = sent
+    else:
+        pcm = PcmStream(path)
+        for _ in pcm:
+            pass
+        sent = pcm.output_seconds
+        total = pcm.input_seconds
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results.put((elapsed, peak_mb, total, sent))
+
+
+def measure(mode: str, path: str) -> tuple:
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=run, args=(mode, path, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def main():
+    minutes = float(sys.argv[1]) if len(sys.argv) > 1 else 60.0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = [("WAV 16 kHz mono", os.path.join(tmp, "dictation.wav"), write_wav)]
+        try:
+            import av  # noqa: F401
+            files.append(("MP3 44.1 kHz stereo", os.path.join(tmp, "dictation.mp3"), write_mp3))
+        except ImportError:
+            print("PyAV not installed; skipping MP3\n")
+
+        for label, path, writer in files:
+            start = time.perf_counter()
+            writer(path, minutes)
+            size_mb = os.path.getsize(path) / 1e6
+            print(f"{label}: {minutes:.0f} min, {size_mb:.0f} MB (generated in {time.perf_counter() - start:.0f} s)")
+            print(f"  {'mode':<8} {'wall (s)':>9} {'peak RSS (MB)':>14} {'audio (s)':>10} {'sent (s)':>9}")
+            for mode in ("whole", "stream"):
+                elapsed, peak_mb, total, sent = measure(mode, path)
+                print(f"  {mode:<8} {elapsed:>9.1f} {peak_mb:>14.0f} {total:>10.0f} {sent:>9.0f}")
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark entity highlighting on a ~100 KB clinical note.
+
+Compares the old str.replace-per-entity approach with the single-pass
+renderer in src/entity_renderer.py.
+
+Usage:
+    python benchmarks/bench_entity_renderer.py
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.entity_renderer import highlight_entities, highlight_placeholders
+
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "sample_texts")
+TARGET_SIZE = 100 * 1024
+
+ENTITY_PATTERNS = [
+    ("Person", r"\b[A-Z][a-z]+ [A-Z][a-z]+\b"),
+    ("DateTime", r"\b\d{1,2}/\d{1,2}/\d{4}\b"),
+    ("Email", r"\b\S+@\S+\.\w+\b"),
+    ("PhoneNumber", r"\+1-\d{3}-\d{4}"),
+    ("Dosage", r"\b\d+\s?mg\b"),
+]
+
+COLORS = {
+    "Person": "#1976D2",
+    "DateTime": "#1E88E5",
+    "Email": "#D32F2F",
+    "PhoneNumber": "#C62828",
+    "Dosage": "#66BB6A",
+}
+
+PLACEHOLDER_COLORS = {
+    "[PERSON]": "#1976D2",
+    "[EMAIL]": "#D32F2F",
+    "[PHONE]": "#D32F2F",
+    "[SSN]": "#D32F2F",
+    "[DATE]": "#1976D2",
+}
+
+
+def build_note() -> str:
+    notes = []
+    for name in sorted(os.listdir(SAMPLE_DIR)):
+        with open(os.path.join(SAMPLE_DIR, name), encoding="utf-8") as f:
+            notes.append(f.read())
+    text = "\n\n".join(notes)
+    return (text + "\n\n") * (TARGET_SIZE // (len(text) + 2) + 1)
+
+
+def find_entities(text: str) -> list:
+    entities = []
+    for category, pattern in ENTITY_PATTERNS:
+        for match in re.finditer(pattern, text):
+            entities.append({
+                "text": match.group(),
+                "category": category,
+                "offset": match.start(),
+                "length": len(match.group()),
+            })
+    return entities
+
+
+def legacy_highlight(text: str, entities: list) -> str:
+    highlighted = text
+    for entity in sorted(entities, key=lambda e: e["offset"], reverse=True):
+        color = COLORS.get(entity["category"], "#888888")
+        replacement = f'<span style="background-color: {color};">{entity["text"]}</span>'
+        highlighted = highlighted.replace(entity["text"], replacement, 1)
+    return highlighted
+
+
+def legacy_placeholders(text: str) -> str:
+    for placeholder, color in PLACEHOLDER_COLORS.items():
+        text = text.replace(placeholder, f'<span style="background-color: {color};">{placeholder}</span>')
+    return text
+
+
+def timed(func, *args, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    note = build_note()
+    entities = find_entities(note)
+    redacted = re.sub(r"\b[A-Z][a-z]+ [A-Z][a-z]+\b", "[PERSON]", note)
+
+    print("=" * 70)
+    print(f"ENTITY HIGHLIGHTING BENCHMARK ({len(note) / 1024:.0f} KB, {len(entities)} entities)")
+    print("=" * 70)
+
+    legacy = timed(legacy_highlight, note, entities, repeat=1)
+    single_pass = timed(highlight_entities, note, entities, COLORS)
+    print(f"Entities      legacy: {legacy * 1000:8.1f} ms   single pass: {single_pass * 1000:8.1f} ms")
+
+    legacy = timed(legacy_placeholders, redacted)
+    single_pass = timed(highlight_placeholders, redacted, PLACEHOLDER_COLORS)
+    print(f"Placeholders  legacy: {legacy * 1000:8.1f} ms   single pass: {single_pass * 1000:8.1f} ms")
@@ -0,0 +1,150 @@
+"""
+Accuracy and latency of the local language identifier behind detect_language.
+
+Accuracy is measured on the sample notes (original and redacted, all English)
+and on held-out sentences in every UI language that are not part of the
+bundled training text. Sentences in languages it does not support must not
+be answered locally. For each input the report shows the guess, its
+confidence and whether MedicalTranslator would still fall back to /detect.
+Exits with status 1 unless every sample note is answered locally and correctly,
+since those are the inputs the fast path exists for.
+
+Usage:
+    python benchmarks/bench_language_id.py [threshold]
+"""
+import glob
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.language_id import identify_language
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HELD_OUT = {
+    "en": [
+        "Patient has Type 2 Diabetes and hypertension.",
+        "Prescribed Metformin 500mg twice daily.",
+        "The wound is healing well and the stitches can be removed next week.",
+        "He denies nausea, vomiting or abdominal pain.",
+    ],
+    "tr": [
+        "Hastada tip 2 diyabet ve hipertansiyon var.",
+        "Günde iki kez 500 mg metformin reçete edildi.",
+        "Yara iyi iyileşiyor ve dikişler gelecek hafta alınabilir.",
+        "Bulantı, kusma veya karın ağrısı tarif etmiyor.",
+    ],
+    "de": [
+        "Der Patient hat Typ-2-Diabetes und Bluthochdruck.",
+        "Metformin 500 mg zweimal täglich verordnet.",
+        "Die Wunde heilt gut und die Fäden können nächste Woche gezogen werden.",
+        "Er verneint Übelkeit, Erbrechen oder Bauchschmerzen.",
+    ],
+    "fr": [
+        "Le patient a un diabète de type 2 et une hypertension.",
+        "Metformine 500 mg prescrite deux fois par jour.",
+        "La plaie cicatrise bien et les points pourront être retirés la semaine prochaine.",
+        "Il nie les nausées, les vomissements ou les douleurs abdominales.",
+    ],
+    "es": [
+        "El paciente tiene diabetes tipo 2 e hipertensión.",
+        "Se recetó metformina 500 mg dos veces al día.",
+        "La herida está cicatrizando bien y los puntos se pueden quitar la próxima semana.",
+        "Niega náuseas, vómitos o dolor abdominal.",
+    ],
+    "ar": [
+        "المريض مصاب بداء السكري من النوع الثاني وارتفاع ضغط الدم.",
+        "تم وصف الميتفورمين 500 ملغ مرتين يوميا.",
+    ],
+    "it": [
+        "Il paziente ha il diabete di tipo 2 e l'ipertensione.",
+        "Prescritta metformina 500 mg due volte al giorno.",
+        "La ferita sta guarendo bene e i punti possono essere rimossi la prossima settimana.",
+        "Nega nausea, vomito o dolore addominale.",
+    ],
+}
+
+
+# Languages the identifier does not know; these must be left to /detect
+UNSUPPORTED = {
+    "pt": [
+        "O paciente tem diabetes tipo 2 e hipertensão.",
+        "A ferida está cicatrizando bem e os pontos podem ser retirados na próxima semana.",
+    ],
+    "nl": [
+        "De patiënt heeft diabetes type 2 en hoge bloeddruk.",
+        "De wond geneest goed en de hechtingen kunnen volgende week worden verwijderd.",
+    ],
+    "ca": ["El pacient té diabetis tipus 2 i hipertensió."],
+    "sv": ["Patienten har typ 2-diabetes och högt blodtryck."],
+    "pl": ["Pacjent ma cukrzycę typu 2 i nadciśnienie."],
+    "fa": ["بیمار مبتلا به دیابت نوع دو و فشار خون بالا است."],
+    "ur": ["مریض کو ٹائپ 2 ذیابیطس اور ہائی بلڈ پریشر ہے۔"],
+}
+
+
+def load_cases() -> list:
+    cases = []
+    for folder in ("sample_texts", "redacted_texts"):
+        for path in sorted(glob.glob(os.path.join(ROOT, "data", folder, "*.txt"))):
+            with open(path, "r", encoding="utf-8") as f:
+                cases.append((f"{folder}/{os.path.basename(path)}", "en", f.read()))
+    for lang, sentences in HELD_OUT.items():
+        for i, sentence in enumerate(sentences, 1):
+            cases.append((f"held-out {lang} #{i}", lang, sentence))
+    for lang, sentences in UNSUPPORTED.items():
+        for i, sentence in enumerate(sentences, 1):
+            cases.append((f"unsupported {lang} #{i}", lang, sentence))
+    return cases
+
+
+def main():
+    threshold = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+    cases = load_cases()
+
+    # Build the bundled profiles once so the first timing is not skewed
+    start = time.perf_counter()
+    identify_language("warm up")
+    print(f"Profile build: {(time.perf_counter() - start) * 1000:.1f} ms (once per process)\n")
+
+    correct = 0
+    local = 0
+    local_correct = 0
+    timings = []
+    notes_missed = []
+    print(f"{'input':<44} {'expected':<8} {'guess':<6} {'conf':>5}  path")
+    for name, expected, text in cases:
+        start = time.perf_counter()
+        for _ in range(20):
+            lang, confidence = identify_language(text)
+        timings.append((time.perf_counter() - start) / 20 * 1e6)
+
+        is_local = lang is not None and confidence >= threshold
+        supported = expected in HELD_OUT
+        correct += lang == expected if supported else not is_local
+        local += is_local
+        local_correct += is_local and lang == expected
+        if not name.startswith(("held-out", "unsupported")) and not (is_local and lang == expected):
+            notes_missed.append(name)
+        if supported:
+            mark = "" if lang == expected else "  <-- wrong"
+        else:
+            mark = "  <-- answered locally" if is_local else ""
+        print(f"{name:<44} {expected:<8} {str(lang):<6} {confidence:5.2f}  {'local' if is_local else '/detect'}{mark}")
+
+    print(f"\nThreshold: {threshold}")
+    print(f"Correct (unsupported = sent to /detect): {correct}/{len(cases)}")
+    print(f"Answered locally:        {local}/{len(cases)}")
+    print(f"Local answers correct:   {local_correct}/{local}")
+    print(f"Latency: median {statistics.median(timings):.0f} µs, max {max(timings):.0f} µs per call")
+
+    if notes_missed:
+        print(f"\n❌ Sample notes not answered locally: {', '.join(notes_missed)}")
+        sys.exit(1)
+    print("\n✅ Every sample note answered locally")
+
+
+if __name__ == "__main__":
+    main()
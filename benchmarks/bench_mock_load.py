@@ -0,0 +1,102 @@
+"""
+Load test of the redaction, translation and batch paths against the local mock.
+
+Starts src.mock_azure.MockAzureServer once per scenario (clean, slow
+network, 429 throttling, server errors) and drives the real clients through
+it: PIIRedactor (Text Analytics v3.1 REST), MedicalTranslator and
+PIIRedactor.process_batch over a folder of notes. Clients retry throttled
+and failed requests themselves, so "failed" only counts documents that
+still ended with an error.
+
+No Azure subscription is needed, and the faults injected follow a fixed seed.
+
+Usage:
+    python benchmarks/bench_mock_load.py [documents] [batch_workers]
+"""
+import contextlib
+import glob
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.mock_azure import MockAzureServer
+from src.pii_redactor import PIIRedactor
+from src.translator import MedicalTranslator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = [
+    ("clean", {}),
+    ("latency 50 ms", {"latency": 0.05, "latency_jitter": 0.02}),
+    ("throttle 10%", {"throttle_rate": 0.1, "retry_after": 1}),
+    ("errors 5%", {"error_rate": 0.05}),
+]
+
+
+def load_notes(count: int) -> list:
+    samples = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "data", "sample_texts", "*.txt"))):
+        with open(path, "r", encoding="utf-8") as f:
+            samples.append(f.read())
+    # Number the copies so the result cache and translation memory never hit
+    return [f"Note {i}. {samples[i % len(samples)]}" for i in range(count)]
+
+
+def run_scenario(options: dict, notes: list, batch_workers: int) -> tuple:
+    rows = []
+    with MockAzureServer(seed=42, **options) as server:
+        credentials = server.credentials()
+
+        redactor = PIIRedactor(api_version="v3.1", credentials=credentials)
+        start = time.perf_counter()
+        results = redactor.process_documents(notes)
+        failed = sum(1 for result in results if result.get("errors"))
+        rows.append(("redact", time.perf_counter() - start, failed))
+
+        translator = MedicalTranslator(credentials=credentials)
+        start = time.perf_counter()
+        translated = translator.translate_many(notes, from_lang="en", to_langs=["tr", "de"])
+        failed = sum(1 for result in translated if result["error"])
+        rows.append(("translate", time.perf_counter() - start, failed))
+        translator.close()
+
+        tmp = tempfile.mkdtemp()
+        try:
+            input_dir = os.path.join(tmp, "in")
+            os.makedirs(input_dir)
+            for i, note in enumerate(notes):
+                with open(os.path.join(input_dir, f"note_{i:05d}.txt"), "w", encoding="utf-8") as f:
+                    f.write(note)
+            start = time.perf_counter()
+            # process_batch prints a line per file; keep the report readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                summary = redactor.process_batch(input_dir, os.path.join(tmp, "out"), max_workers=batch_workers)
+            rows.append(("batch", time.perf_counter() - start, len(summary["errors"])))
+        finally:
+            shutil.rmtree(tmp)
+
+        stats = server.stats()
+    return rows, stats
+
+
+def main():
+    documents = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    batch_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    notes = load_notes(documents)
+
+    print(f"{documents} notes, batch path with {batch_workers} workers\n")
+    print(f"{'scenario':<15} {'path':<10} {'wall (s)':>9} {'docs/s':>8} {'failed':>7}")
+    for name, options in SCENARIOS:
+        rows, stats = run_scenario(options, notes, batch_workers)
+        for path, elapsed, failed in rows:
+            print(f"{name:<15} {path:<10} {elapsed:>9.2f} {documents / elapsed:>8.0f} {failed:>7}")
+        requests = sum(count for route, count in stats.items())
+        print(f"{'':<15} {requests} requests, {stats.get('throttled', 0)} throttled, {stats.get('errors', 0)} errors\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Cold-start import cost of the src package, measured with python -X importtime.
+
+Each module is imported in a fresh interpreter. The report shows its
+cumulative import time and the slowest imports under it, and the run fails
+(exit code 1) when a module goes over its budget or pulls in a heavy SDK
+that should only load when its feature is used. Run it in CI to keep
+startup fast.
+
+Usage:
+    python benchmarks/bench_startup.py [--budget-ms N] [--runs N]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Module -> import budget in milliseconds (best of --runs)
+BUDGETS_MS = {
+    "src.service_registry": 20,
+    "src.keyvault_config": 40,
+    "src.credentials": 30,
+    "src.pii_redactor": 60,
+    "src.speech_processor": 60,
+    "src.voice_pipeline": 80,
+    "src.translator": 200,
+    "src.redact_translate": 250,
+}
+
+# Heavy dependencies that must not be imported by merely importing src modules
+DEFERRED = (
+    "azure.identity",
+    "azure.keyvault.secrets",
+    "azure.ai.textanalytics",
+    "azure.cognitiveservices.speech",
+    "PyPDF2",
+    "docx",
+    "av",
+)
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_profile(module: str) -> list:
+    """(cumulative_us, depth, name) for every module imported by `import module`"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+            entries.append((cumulative, (len(indent) - 1) // 2, name))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget check")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Override every module's budget")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per module; the best run counts")
+    args = parser.parse_args()
+
+    failures = []
+    for module, budget_ms in BUDGETS_MS.items():
+        budget_ms = args.budget_ms or budget_ms
+        runs = [import_profile(module) for _ in range(args.runs)]
+        best = min(runs, key=lambda entries: next(c for c, _, name in entries if name == module))
+        total_ms = next(c for c, _, name in best if name == module) / 1000
+        loaded = {name for _, _, name in best}
+
+        status = "ok" if total_ms <= budget_ms else "OVER BUDGET"
+        print(f"{module:<24} {total_ms:7.1f} ms  (budget {budget_ms:.0f} ms)  {status}")
+        # Slowest direct children of the module; importtime lists them just before it
+        children = []
+        pending = []
+        for cumulative, depth, name in best:
+            if depth == 1:
+                pending.append((cumulative, name))
+            elif depth == 0:
+                if name == module:
+                    children = sorted(pending, reverse=True)[:3]
+                pending = []
+        for cumulative, name in children:
+            print(f"    {cumulative / 1000:7.1f} ms  {name}")
+
+        if total_ms > budget_ms:
+            failures.append(f"{module} took {total_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+        for heavy in DEFERRED:
+            if heavy in loaded:
+                failures.append(f"{module} imports {heavy} eagerly")
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nAll modules within budget; no heavy SDK imported eagerly.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Throughput of SpeechProcessor.transcribe_batch against a stubbed recognizer.
+
+The stub plays each "file" back in real time divided by SPEEDUP, firing
+recognized events from its own thread like the Speech SDK does, so the
+numbers show how throughput scales with max_concurrency without touching
+Azure or needing audio files.
+
+Usage:
+    python benchmarks/bench_transcribe_batch.py [files] [seconds_per_file]
+"""
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.speech_processor import TICKS_PER_SECOND, SpeechProcessor, speechsdk
+
+SPEEDUP = 100
+SEGMENT_SECONDS = 5.0
+
+
+class Signal:
+    def __init__(self):
+        self.handlers = []
+
+    def connect(self, handler):
+        self.handlers.append(handler)
+
+    def fire(self, evt):
+        for handler in self.handlers:
+            handler(evt)
+
+
+class StubRecognizer:
+    """Stands in for speechsdk.SpeechRecognizer with continuous recognition"""
+
+    def __init__(self, audio_file_path: str, audio_seconds: float):
+        self.audio_seconds = audio_seconds
+        self.recognized = Signal()
+        self.session_stopped = Signal()
+        self.canceled = Signal()
+
+    def _run(self):
+        offset = 0.0
+        while offset < self.audio_seconds:
+            duration = min(SEGMENT_SECONDS, self.audio_seconds - offset)
+            time.sleep(duration / SPEEDUP)
+            result = SimpleNamespace(
+                reason=speechsdk.ResultReason.RecognizedSpeech,
+                text="Patient reports chest pain.",
+                offset=int(offset * TICKS_PER_SECOND),
+                duration=int(duration * TICKS_PER_SECOND),
+            )
+            self.recognized.fire(SimpleNamespace(result=result))
+            offset += duration
+        self.session_stopped.fire(SimpleNamespace())
+
+    def start_continuous_recognition(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop_continuous_recognition(self):
+        pass
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    seconds_per_file = float(sys.argv[2]) if len(sys.argv) > 2 else 60.0
+
+    processor = SpeechProcessor(recognizer_factory=lambda path: StubRecognizer(path, seconds_per_file))
+    paths = [f"dictation_{i:04d}.wav" for i in range(files)]
+
+    print(f"{files} files x {seconds_per_file:.0f} s audio, stub runs at {SPEEDUP}x real time\n")
+    print(f"{'max_concurrency':>15} {'wall (s)':>9} {'audio-s/wall-s':>15}")
+    for concurrency in (1, 4, 8, 16):
+        start = time.perf_counter()
+        for result in processor.transcribe_batch(paths, max_concurrency=concurrency):
+            pass
+        print(f"{concurrency:>15} {time.perf_counter() - start:>9.2f} {result['throughput']:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
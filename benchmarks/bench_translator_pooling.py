@@ -0,0 +1,91 @@
+"""
+Per-call latency of MedicalTranslator against a local stub Translator.
+
+Compares a bare requests.post per call (the old behaviour) with the pooled
+session MedicalTranslator now keeps. The stub speaks HTTP/1.1 keep-alive on
+localhost, so the difference shown is TCP connection setup plus per-call
+session construction; against the real endpoint TLS handshakes widen the gap.
+
+Usage:
+    python benchmarks/bench_translator_pooling.py [calls]
+"""
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.translator import MedicalTranslator
+
+
+class StubTranslatorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        payload = json.dumps([{"translations": [{"text": item["text"][::-1], "to": "tr"}]} for item in body]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def legacy_translate(endpoint: str, text: str) -> str:
+    headers = {
+        "Ocp-Apim-Subscription-Key": "stub",
+        "Ocp-Apim-Subscription-Region": "global",
+        "Content-type": "application/json",
+        "X-ClientTraceId": str(uuid.uuid4()),
+    }
+    params = {"api-version": "3.0", "from": "en", "to": "tr"}
+    response = requests.post(endpoint + "/translate", params=params, headers=headers, json=[{"text": text}])
+    response.raise_for_status()
+    return response.json()[0]["translations"][0]["text"]
+
+
+def measure(func, calls: int) -> list:
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        func("Prescribed Metformin 500mg twice daily.")
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+if __name__ == "__main__":
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubTranslatorHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+
+    os.environ["TRANSLATOR_ENDPOINT"] = endpoint
+    os.environ.setdefault("TRANSLATOR_KEY", "stub")
+    translator = MedicalTranslator()
+
+    legacy = measure(lambda text: legacy_translate(endpoint, text), calls)
+    pooled = measure(lambda text: translator.translate(text, "en", "tr"), calls)
+
+    print("=" * 70)
+    print(f"TRANSLATOR PER-CALL LATENCY ({calls} calls, local stub)")
+    print("=" * 70)
+    for label, timings in (("requests.post", legacy), ("pooled session", pooled)):
+        print(
+            f"{label:15s} mean {statistics.mean(timings):6.2f} ms   "
+            f"p50 {statistics.median(timings):6.2f} ms   "
+            f"p95 {sorted(timings)[int(len(timings) * 0.95)]:6.2f} ms"
+        )
+
+    translator.close()
+    server.shutdown()
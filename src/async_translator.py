@@ -0,0 +1,236 @@
+import asyncio
+import random
+import time
+import uuid
+
+import httpx
+
+from src.credentials import default_provider
+from src.translator import API_VERSION, MAX_CHARS_PER_REQUEST, join_translations, pack_requests, read_translations, split_segments
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """
+    Async token bucket for character quotas
+    Refills continuously at rate_per_minute; callers wait until enough tokens exist
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        """
+        Args:
+            rate_per_minute: Tokens (characters) added per minute
+            capacity: Largest burst allowed (defaults to one minute of quota)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float) -> None:
+        """
+        Wait until amount tokens are available and take them
+        An amount above capacity waits for a full bucket and is charged in full;
+        the deficit delays later callers, so the average rate still holds.
+        """
+        needed = min(amount, self.capacity)
+        # The lock keeps waiters first-come, first-served
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= needed:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((needed - self.tokens) / self.rate)
+
+
+class AsyncMedicalTranslator:
+    """
+    Asynchronous Azure Translator client for bulk medical translation
+    Rate-limited to the Translator tier's character quota, with 429/Retry-After handling
+    """
+
+    def __init__(
+        self,
+        chars_per_minute: float = 33000,
+        max_concurrency: int = 8,
+        timeout: float = 30.0,
+        max_retries: int = 5,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 60.0,
+        credentials=None,
+    ):
+        """
+        Args:
+            chars_per_minute: Character quota of the Translator tier; the default
+                matches F0 (2M characters per hour, about 33,000 per minute).
+                S1 allows 40M per hour, about 666,000 per minute.
+            max_concurrency: Requests in flight at once
+            timeout: Per-request timeout in seconds
+            max_retries: Retries for transport errors, 429 and 5xx responses
+            backoff_factor: Exponential backoff base in seconds when no Retry-After is sent
+            max_backoff: Longest single wait between retries
+            credentials: CredentialProvider for TRANSLATOR_KEY / _ENDPOINT / _REGION
+                (process-wide default_provider() if None)
+
+        Example:
+            async with AsyncMedicalTranslator() as translator:
+                turkish = await translator.translate_all(notes, "en", "tr")
+        """
+        credentials = credentials or default_provider()
+        self.key = credentials.get("TRANSLATOR_KEY")
+        self.endpoint = credentials.get("TRANSLATOR_ENDPOINT", "https://api.cognitive.microsofttranslator.com")
+        self.region = credentials.get("TRANSLATOR_REGION", "global")
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+
+        self.bucket = TokenBucket(chars_per_minute)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.client = httpx.AsyncClient(
+            base_url=self.endpoint,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+            headers={
+                'Ocp-Apim-Subscription-Key': self.key or "",
+                'Ocp-Apim-Subscription-Region': self.region,
+                'Content-type': 'application/json'
+            },
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Release pooled connections"""
+        await self.client.aclose()
+
+    def _retry_delay(self, attempt: int, response: httpx.Response = None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.max_backoff)
+                except ValueError:
+                    pass
+        delay = self.backoff_factor * (2 ** attempt)
+        return min(delay + random.uniform(0, delay / 2), self.max_backoff)
+
+    async def _post(self, path: str, params: dict, body: list, chars: int) -> list:
+        await self.bucket.acquire(chars)
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    response = await self.client.post(
+                        path,
+                        params=params,
+                        json=body,
+                        headers={'X-ClientTraceId': str(uuid.uuid4())}
+                    )
+                except httpx.TransportError:
+                    if attempt == self.max_retries:
+                        raise
+                    await asyncio.sleep(self._retry_delay(attempt))
+                    continue
+
+                if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                    await asyncio.sleep(self._retry_delay(attempt, response))
+                    continue
+
+                response.raise_for_status()
+                return response.json()
+
+    async def translate_many(self, texts: list, from_lang: str = "en", to_langs: list = None, text_type: str = "plain") -> list:
+        """
+        Translate many texts concurrently into one or more languages
+
+        Same packing and result format as MedicalTranslator.translate_many;
+        the packed requests are sent concurrently within the rate limit.
+
+        Returns:
+            One dict per input text: {"text", "translations": {lang: str}, "error"}
+        """
+        to_langs = list(to_langs or ["tr"])
+        # No request may exceed the bucket's burst, or it would run over the quota
+        max_chars = int(min(MAX_CHARS_PER_REQUEST, self.bucket.capacity))
+        segments, owners = split_segments(texts, len(to_langs), max_chars=max_chars)
+        # Each distinct segment is sent once
+        keys = list(dict.fromkeys(segment.strip() for segment in segments if segment.strip()))
+
+        params = {'api-version': API_VERSION, 'to': to_langs, 'textType': text_type}
+        if from_lang:
+            params['from'] = from_lang
+
+        batches = [[keys[i] for i in indexes] for indexes in pack_requests(keys, len(to_langs), max_chars)]
+        responses = await asyncio.gather(
+            *(
+                self._post(
+                    '/translate',
+                    params,
+                    [{'text': key} for key in batch],
+                    sum(len(key) for key in batch) * len(to_langs),
+                )
+                for batch in batches
+            ),
+            return_exceptions=True,
+        )
+
+        translations = {}
+        errors = {}
+        for batch, response in zip(batches, responses):
+            if isinstance(response, Exception):
+                for key in batch:
+                    errors[key] = str(response)
+            else:
+                read_translations(response, batch, translations, errors)
+
+        return join_translations(texts, segments, owners, to_langs, translations, errors)
+
+    async def translate(self, text: str, from_lang: str = "en", to_lang: str = "tr") -> str:
+        """
+        Translate medical text
+
+        Returns:
+            Translated text, or "Translation error: ..." like MedicalTranslator.translate
+        """
+        result = (await self.translate_many([text], from_lang, [to_lang]))[0]
+        if result["error"]:
+            return f"Translation error: {result['error']}"
+        return result["translations"][to_lang]
+
+    async def translate_all(self, texts: list, from_lang: str = "en", to_lang: str = "tr") -> list:
+        """
+        Bulk-translate texts into one language, gather-style
+
+        Returns:
+            Translated strings in input order ("Translation error: ..." for failures)
+        """
+        results = await self.translate_many(texts, from_lang, [to_lang])
+        return [
+            f"Translation error: {result['error']}" if result["error"] else result["translations"][to_lang]
+            for result in results
+        ]
+
+
+# Test
+if __name__ == "__main__":
+    notes = [
+        "Patient has Type 2 Diabetes and hypertension.",
+        "Prescribed Metformin 500mg twice daily.",
+        "Blood pressure: 140/90 mmHg. Heart rate: 82 bpm."
+    ]
+
+    async def main():
+        async with AsyncMedicalTranslator() as translator:
+            for note, turkish in zip(notes, await translator.translate_all(notes, "en", "tr")):
+                print(f"\n📝 Original (EN): {note}")
+                print(f"🇹🇷 Turkish: {turkish}")
+
+    asyncio.run(main())
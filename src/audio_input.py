@@ -0,0 +1,241 @@
+import io
+import sys
+import wave
+from array import array
+from collections import deque
+
+# Format the Speech service is happiest with; other audio is converted to it
+TARGET_SAMPLE_RATE = 16000
+TARGET_CHANNELS = 1
+SAMPLE_WIDTH = 2  # 16-bit PCM
+
+# Bytes handed to the Speech SDK per read (about 1 s of 16 kHz mono audio)
+CHUNK_BYTES = 32000
+
+# Silence trimming works on 20 ms frames; a frame is silent when no sample
+# peaks above SILENCE_PEAK (about -36 dBFS)
+FRAME_SECONDS = 0.02
+SILENCE_PEAK = 500
+KEEP_SILENCE_SECONDS = 0.3
+# Silence inside a recording is held back only this long before it is sent
+# anyway, which bounds memory; trailing silence beyond it is still trimmed
+MAX_HELD_SILENCE_SECONDS = 300
+
+
+def _is_wav(header: bytes) -> bool:
+    return header[:4] == b"RIFF" and header[8:12] == b"WAVE"
+
+
+def _open_source(source):
+    """Seekable binary file object for a path, bytes-like object or file-like object"""
+    if isinstance(source, str):
+        return open(source, "rb")
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if hasattr(source, "read"):
+        if hasattr(source, "seekable") and source.seekable():
+            # Streamlit's UploadedFile may already have been read once
+            source.seek(0)
+            return source
+        return io.BytesIO(source.read())
+    raise TypeError(f"Unsupported audio source: {type(source).__name__}")
+
+
+class PcmStream:
+    """
+    Lazily decoded PCM audio for the Speech SDK
+    Compressed formats are decoded, downmixed and resampled to 16 kHz mono
+    16-bit PCM in chunks, and long leading/trailing silence is dropped, so
+    whole recordings are never held in memory.
+    """
+
+    def __init__(
+        self,
+        source,
+        trim_silence: bool = True,
+        silence_peak: int = SILENCE_PEAK,
+        keep_silence_seconds: float = KEEP_SILENCE_SECONDS,
+        chunk_bytes: int = CHUNK_BYTES,
+    ):
+        """
+        Args:
+            source: File path, bytes, or binary file-like object (WAV, MP3, M4A, ...)
+            trim_silence: Drop silence before the first and after the last sound
+            silence_peak: Samples at or below this absolute value count as silence
+            keep_silence_seconds: Silence kept next to speech at both ends
+            chunk_bytes: Approximate size of the chunks yielded
+
+        Raises:
+            ValueError: If the audio cannot be decoded
+
+        Example:
+            stream = PcmStream("dictation.mp3")
+            for chunk in stream:
+                send(chunk)
+            print(stream.leading_trimmed_seconds)
+        """
+        self.trim_silence = trim_silence
+        self.silence_peak = silence_peak
+        self.keep_silence_seconds = keep_silence_seconds
+        self.chunk_bytes = chunk_bytes
+
+        self.input_seconds = 0.0
+        self.output_seconds = 0.0
+        self.leading_trimmed_seconds = 0.0
+        self.trailing_trimmed_seconds = 0.0
+        # Set by consumers that cannot raise (e.g. SDK callbacks) when decoding fails midway
+        self.error = None
+
+        self._file = _open_source(source)
+        self._owns_file = isinstance(source, str)
+        header = self._file.read(12)
+        self._file.seek(0)
+
+        try:
+            if _is_wav(header) and self._open_wav():
+                return
+            self._open_pyav()
+        except Exception:
+            self.close()
+            raise
+
+    def _open_wav(self) -> bool:
+        """Stream a PCM WAV as-is when no conversion is needed (or PyAV is missing)"""
+        try:
+            self._wav = wave.open(self._file, "rb")
+        except (wave.Error, EOFError) as e:
+            raise ValueError(f"Invalid WAV audio: {e}")
+
+        native = (
+            self._wav.getframerate() == TARGET_SAMPLE_RATE
+            and self._wav.getnchannels() == TARGET_CHANNELS
+            and self._wav.getsampwidth() == SAMPLE_WIDTH
+        )
+        if not native:
+            try:
+                import av  # noqa: F401
+                self._wav.close()
+                self._file.seek(0)
+                return False
+            except ImportError:
+                # The Speech SDK accepts other PCM rates and channel counts too
+                pass
+
+        self.sample_rate = self._wav.getframerate()
+        self.channels = self._wav.getnchannels()
+        self.bits_per_sample = self._wav.getsampwidth() * 8
+        self._decoder = self._iter_wav()
+        return True
+
+    def _iter_wav(self):
+        frames_per_chunk = max(1, self.chunk_bytes // (self.channels * self.bits_per_sample // 8))
+        while True:
+            data = self._wav.readframes(frames_per_chunk)
+            if not data:
+                return
+            yield data
+
+    def _open_pyav(self):
+        try:
+            import av
+        except ImportError:
+            print("  ⚠️ PyAV not installed. Run: pip install av")
+            raise ValueError("PyAV not installed; only WAV audio can be read")
+
+        try:
+            self._container = av.open(self._file, mode="r")
+            self._container.streams.audio[0]
+        except (av.error.FFmpegError, IndexError) as e:
+            raise ValueError(f"Could not decode audio: {e}")
+
+        self.sample_rate = TARGET_SAMPLE_RATE
+        self.channels = TARGET_CHANNELS
+        self.bits_per_sample = SAMPLE_WIDTH * 8
+        self._decoder = self._iter_pyav(av)
+
+    def _iter_pyav(self, av):
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=TARGET_SAMPLE_RATE)
+        try:
+            for frame in self._container.decode(audio=0):
+                for resampled in resampler.resample(frame):
+                    yield bytes(resampled.planes[0])[:resampled.samples * SAMPLE_WIDTH]
+            # Flush samples the resampler is still holding
+            for resampled in resampler.resample(None):
+                yield bytes(resampled.planes[0])[:resampled.samples * SAMPLE_WIDTH]
+        except av.error.FFmpegError as e:
+            raise ValueError(f"Could not decode audio: {e}")
+
+    def _iter_trimmed(self, chunks):
+        """Drop silent 20 ms frames at both ends, keeping a little padding"""
+        frame_bytes = int(self.sample_rate * FRAME_SECONDS) * self.channels * SAMPLE_WIDTH
+        keep = int(self.keep_silence_seconds / FRAME_SECONDS)
+        max_held = int(MAX_HELD_SILENCE_SECONDS / FRAME_SECONDS)
+        swap = sys.byteorder == "big"  # WAV and the SDK use little-endian samples
+
+        held = deque()
+        started = False
+        dropped = 0
+        buffer = b""
+        out = bytearray()
+
+        for chunk in chunks:
+            buffer += chunk
+            usable = len(buffer) - len(buffer) % frame_bytes
+            for start in range(0, usable, frame_bytes):
+                frame = buffer[start:start + frame_bytes]
+                samples = array("h", frame)
+                if swap:
+                    samples.byteswap()
+                if max(samples) > self.silence_peak or -min(samples) > self.silence_peak:
+                    if not started:
+                        started = True
+                        self.leading_trimmed_seconds = dropped * FRAME_SECONDS
+                    out += b"".join(held)
+                    held.clear()
+                    out += frame
+                else:
+                    held.append(frame)
+                    if not started and len(held) > keep:
+                        held.popleft()
+                        dropped += 1
+                    elif started and len(held) > max_held:
+                        out += held.popleft()
+                if len(out) >= self.chunk_bytes:
+                    yield bytes(out)
+                    out.clear()
+            buffer = buffer[usable:]
+
+        if started:
+            kept = list(held)[:keep]
+            out += b"".join(kept)
+            self.trailing_trimmed_seconds = (len(held) - len(kept)) * FRAME_SECONDS + len(buffer) / (
+                self.sample_rate * self.channels * SAMPLE_WIDTH
+            )
+        else:
+            # Nothing but silence: everything counts as leading silence
+            self.leading_trimmed_seconds = (dropped + len(held)) * FRAME_SECONDS
+        if out:
+            yield bytes(out)
+
+    def _iter_counted(self, chunks, attribute: str):
+        bytes_per_second = self.sample_rate * self.channels * (self.bits_per_sample // 8)
+        for chunk in chunks:
+            setattr(self, attribute, getattr(self, attribute) + len(chunk) / bytes_per_second)
+            yield chunk
+
+    def __iter__(self):
+        chunks = self._iter_counted(self._decoder, "input_seconds")
+        if self.trim_silence and self.bits_per_sample == 16:
+            chunks = self._iter_trimmed(chunks)
+        try:
+            yield from self._iter_counted(chunks, "output_seconds")
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        for name in ("_wav", "_container"):
+            handle = getattr(self, name, None)
+            if handle is not None:
+                handle.close()
+        if self._owns_file:
+            self._file.close()
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+
+class BatchManifest:
+    """
+    Checkpoint manifest for resumable batch jobs
+    Append-only JSON Lines file in the output folder; the last line for a path wins.
+    Superseded lines are compacted away when the manifest is opened, so the
+    file stays at one line per input file across reruns.
+    Only each path's fingerprint, status and line offset are held in memory;
+    the recorded file_result is read back from disk when it is needed.
+    """
+
+    FILENAME = "batch_manifest.jsonl"
+
+    def __init__(self, output_dir: str):
+        """
+        Args:
+            output_dir: Batch output folder; the manifest lives next to the redacted files
+        """
+        self.path = os.path.join(output_dir, self.FILENAME)
+        self._index = {}  # path -> (size, mtime, sha256, status, byte offset of its line)
+        self._lock = threading.Lock()
+
+        lines = 0
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                offset = 0
+                for line in f:
+                    lines += 1
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash can leave a truncated last line behind
+                        offset += len(line)
+                        continue
+                    self._index[entry["path"]] = self._index_entry(entry, offset)
+                    offset += len(line)
+
+        os.makedirs(output_dir, exist_ok=True)
+        if lines > len(self._index):
+            self._compact()
+        self._file = open(self.path, "ab")
+        self._reader = open(self.path, "rb")
+
+    @staticmethod
+    def _index_entry(entry: dict, offset: int) -> tuple:
+        return (entry["size"], entry["mtime"], entry["sha256"], entry["status"], offset)
+
+    def _compact(self) -> None:
+        """Rewrite the manifest with only the latest line per path"""
+        temp_path = self.path + ".tmp"
+        with open(self.path, "rb") as source, open(temp_path, "wb") as target:
+            offset = 0
+            for line in source:
+                position = offset
+                offset += len(line)
+                try:
+                    path = json.loads(line)["path"]
+                except json.JSONDecodeError:
+                    continue
+                indexed = self._index.get(path)
+                if indexed is None or indexed[4] != position:
+                    continue
+                self._index[path] = indexed[:4] + (target.tell(),)
+                target.write(line if line.endswith(b"\n") else line + b"\n")
+        # Atomic on the same filesystem: a crash leaves the old or the new file
+        os.replace(temp_path, self.path)
+
+    @staticmethod
+    def fingerprint(filepath: str, with_hash: bool = True) -> dict:
+        """Size, mtime and (optionally) SHA-256 of a file"""
+        stat = os.stat(filepath)
+        result = {"size": stat.st_size, "mtime": stat.st_mtime}
+        if with_hash:
+            digest = hashlib.sha256()
+            with open(filepath, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+            result["sha256"] = digest.hexdigest()
+        return result
+
+    def get(self, filepath: str):
+        """Latest manifest entry for filepath (read from disk), or None"""
+        with self._lock:
+            indexed = self._index.get(os.path.abspath(filepath))
+            if indexed is None:
+                return None
+            self._reader.seek(indexed[4])
+            return json.loads(self._reader.readline())
+
+    def is_done(self, filepath: str) -> bool:
+        """
+        True if filepath was processed successfully and has not changed since
+        Size and mtime are checked first; the content hash only when they differ
+
+        Raises:
+            OSError: If filepath can no longer be read (e.g. deleted mid-run)
+        """
+        indexed = self._index.get(os.path.abspath(filepath))
+        if indexed is None:
+            return False
+        size, mtime, sha256, status, _ = indexed
+        if status != "done":
+            return False
+
+        current = self.fingerprint(filepath, with_hash=False)
+        if current["size"] == size and current["mtime"] == mtime:
+            return True
+        if current["size"] != size:
+            return False
+        return self.fingerprint(filepath)["sha256"] == sha256
+
+    def record(self, filepath: str, status: str, file_result: dict = None, errors: list = None) -> None:
+        """
+        Append the outcome for one input file
+
+        Raises:
+            OSError: If filepath can no longer be read (e.g. deleted mid-run)
+
+        Args:
+            filepath: Input file
+            status: "done" or "failed"; failed files are retried on the next run
+            file_result: Per-file summary to replay when the file is skipped later
+            errors: Error messages for this file
+        """
+        entry = {
+            "path": os.path.abspath(filepath),
+            **self.fingerprint(filepath),
+            "status": status,
+            "timestamp": datetime.now().isoformat(),
+            "file_result": file_result,
+            "errors": errors or [],
+        }
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(line)
+            self._file.flush()
+            self._index[entry["path"]] = self._index_entry(entry, offset)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+            self._reader.close()
@@ -0,0 +1,156 @@
+import json
+import os
+import threading
+from functools import lru_cache
+from dotenv import dotenv_values, load_dotenv
+
+_MISSING = object()
+
+
+class CredentialProvider:
+    """
+    Source of service endpoints and keys (LANGUAGE_KEY, TRANSLATOR_KEY, ...)
+    Each name is looked up once and then served from memory, so one provider
+    can be shared by every service constructor.
+    Subclasses implement _lookup(name) and return None for unknown names.
+    """
+
+    def __init__(self):
+        self._resolved = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, name: str):
+        raise NotImplementedError
+
+    def get(self, name: str, default: str = None) -> str:
+        """
+        Value of a credential, e.g. get("TRANSLATOR_REGION", "global")
+
+        Args:
+            name: Environment-style name (LANGUAGE_ENDPOINT, SPEECH_KEY, ...)
+            default: Returned when the provider has no value for name
+        """
+        value = self._resolved.get(name, _MISSING)
+        if value is _MISSING:
+            with self._lock:
+                value = self._resolved.get(name, _MISSING)
+                if value is _MISSING:
+                    value = self._lookup(name) or None
+                    self._resolved[name] = value
+        return default if value is None else value
+
+    def require(self, *names: str) -> tuple:
+        """
+        Values of several credentials that must all be set
+
+        Raises:
+            ValueError: Listing every missing name
+        """
+        values = tuple(self.get(name) for name in names)
+        missing = [name for name, value in zip(names, values) if not value]
+        if missing:
+            raise ValueError(f"{' and '.join(missing)} must be set")
+        return values
+
+    def clear(self) -> None:
+        """Forget resolved values; the next get() looks them up again"""
+        with self._lock:
+            self._resolved.clear()
+
+
+class EnvCredentialProvider(CredentialProvider):
+    """Environment variables, with .env loaded once when the provider is created"""
+
+    def __init__(self, dotenv_path: str = None):
+        super().__init__()
+        load_dotenv(dotenv_path)
+
+    def _lookup(self, name: str):
+        return os.getenv(name)
+
+
+class FileCredentialProvider(CredentialProvider):
+    """
+    Credentials read once from a JSON object or a .env-style file
+
+    Example:
+        credentials = FileCredentialProvider("config/local.json")
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        if path.lower().endswith(".json"):
+            with open(path, "r", encoding="utf-8") as f:
+                values = json.load(f)
+        else:
+            values = dotenv_values(path)
+        self.values = {name: str(value) for name, value in values.items() if value is not None}
+
+    def _lookup(self, name: str):
+        return self.values.get(name)
+
+
+class MemoryCredentialProvider(CredentialProvider):
+    """
+    Credentials from a dict, e.g. to point the services at a local mock
+
+    Example:
+        credentials = MemoryCredentialProvider({
+            "LANGUAGE_ENDPOINT": "http://localhost:8080",
+            "LANGUAGE_KEY": "mock-key",
+        })
+    """
+
+    def __init__(self, values: dict = None):
+        super().__init__()
+        self.values = dict(values or {})
+
+    def _lookup(self, name: str):
+        return self.values.get(name)
+
+
+class KeyVaultCredentialProvider(CredentialProvider):
+    """
+    Credentials from Azure Key Vault (LANGUAGE_KEY is stored as LANGUAGE-KEY)
+    KeyVaultConfig already caches secrets, rotates them before they expire and
+    remembers failed fetches for MISS_TTL_SECONDS, so lookups go straight to
+    it instead of being pinned here.
+    """
+
+    def __init__(self, config=None, **keyvault_options):
+        """
+        Args:
+            config: Existing KeyVaultConfig to share
+            **keyvault_options: Passed to KeyVaultConfig when config is None
+        """
+        super().__init__()
+        if config is None:
+            from src.keyvault_config import KeyVaultConfig
+            config = KeyVaultConfig(**keyvault_options)
+        self.config = config
+
+    def _lookup(self, name: str):
+        return self.config.get_credential(name.replace("_", "-"))
+
+    def get(self, name: str, default: str = None) -> str:
+        value = self._lookup(name)
+        return value if value else default
+
+    def prefetch(self, names: list) -> dict:
+        return self.config.prefetch([name.replace("_", "-") for name in names])
+
+
+@lru_cache(maxsize=1)
+def default_provider() -> CredentialProvider:
+    """
+    Process-wide provider used by services created without one
+    Key Vault when KEY_VAULT_URL is set, a file when CREDENTIALS_FILE is set,
+    otherwise environment variables / .env.
+    """
+    load_dotenv()
+    if os.getenv("KEY_VAULT_URL"):
+        return KeyVaultCredentialProvider()
+    if os.getenv("CREDENTIALS_FILE"):
+        return FileCredentialProvider(os.getenv("CREDENTIALS_FILE"))
+    return EnvCredentialProvider()
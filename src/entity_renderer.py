@@ -0,0 +1,73 @@
+import html
+import re
+
+
+ENTITY_STYLE = "background-color: {color}; padding: 2px 4px; border-radius: 3px; font-weight: bold;"
+PLACEHOLDER_STYLE = "background-color: {color}; color: white; padding: 2px 6px; border-radius: 4px; font-weight: bold;"
+
+
+def highlight_entities(
+    text: str,
+    entities: list,
+    color_map: dict,
+    default_color: str = "#888888",
+    style: str = ENTITY_STYLE,
+) -> str:
+    """
+    Build HTML with every entity wrapped in a coloured span, in one pass
+
+    Entities are placed by offset, so repeated words highlight the right
+    occurrence and inserted markup is never searched again. Text between
+    entities is HTML-escaped. When entities overlap, the one starting first
+    (the longest on ties) wins.
+
+    Args:
+        text: Text the entity offsets refer to
+        entities: Entity dicts with offset, length and category
+        color_map: Category -> CSS colour
+        default_color: Colour for categories missing from color_map
+        style: Inline CSS template with a {color} field
+
+    Returns:
+        HTML string
+    """
+    parts = []
+    position = 0
+    for entity in sorted(entities, key=lambda e: (e["offset"], -e["length"])):
+        start = entity["offset"]
+        end = start + entity["length"]
+        if start < position or end > len(text):
+            continue
+
+        color = color_map.get(entity["category"], default_color)
+        parts.append(html.escape(text[position:start]))
+        parts.append(f'<span style="{style.format(color=color)}">{html.escape(text[start:end])}</span>')
+        position = end
+
+    parts.append(html.escape(text[position:]))
+    return "".join(parts)
+
+
+def highlight_placeholders(redacted_text: str, placeholder_colors: dict, style: str = PLACEHOLDER_STYLE) -> str:
+    """
+    Colour redaction placeholders such as [PERSON] with a single regex pass
+
+    Args:
+        redacted_text: Output of PIIRedactor.redact_text
+        placeholder_colors: Placeholder -> CSS colour, e.g. {"[PERSON]": "#1976D2"}
+        style: Inline CSS template with a {color} field
+
+    Returns:
+        HTML string
+    """
+    escaped = html.escape(redacted_text)
+    if not placeholder_colors:
+        return escaped
+
+    # Placeholders contain no HTML special characters, so they survive escaping
+    pattern = re.compile("|".join(re.escape(html.escape(p)) for p in sorted(placeholder_colors, key=len, reverse=True)))
+    colors = {html.escape(p): color for p, color in placeholder_colors.items()}
+    return pattern.sub(
+        lambda match: f'<span style="{style.format(color=colors[match.group()])}">{match.group()}</span>',
+        escaped,
+    )
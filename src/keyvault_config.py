@@ -1,69 +1,236 @@
-from azure.identity import DefaultAzureCredential
-from azure.keyvault.secrets import SecretClient
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from dotenv import load_dotenv
+from src.lazy_import import LazyModule
+
+# azure.identity alone takes ~100 ms to import; load it only when Key Vault is used
+identity = LazyModule("azure.identity")
+keyvault_secrets = LazyModule("azure.keyvault.secrets")
+
+# DefaultAzureCredential probes these in order; each maps to its exclude_* flag
+CREDENTIAL_SOURCES = {
+    "environment": "exclude_environment_credential",
+    "workload_identity": "exclude_workload_identity_credential",
+    "managed_identity": "exclude_managed_identity_credential",
+    "shared_token_cache": "exclude_shared_token_cache_credential",
+    "visual_studio_code": "exclude_visual_studio_code_credential",
+    "cli": "exclude_cli_credential",
+    "powershell": "exclude_powershell_credential",
+    "developer_cli": "exclude_developer_cli_credential",
+}
+
+DEFAULT_SECRET_TTL_SECONDS = 3600
+# Secrets are re-fetched in the background once this share of their TTL is left
+REFRESH_MARGIN = 0.2
+# Longest the refresh thread sleeps between checks
+MAX_REFRESH_SLEEP_SECONDS = 60
+# After a failed fetch, Key Vault is not asked for that secret again for this long
+MISS_TTL_SECONDS = 60
+
 
 class KeyVaultConfig:
     """
     Secure credential management with Azure Key Vault
     Falls back to .env if Key Vault unavailable (development mode)
+    Secrets are cached in memory with a TTL and refreshed in the background
+    before they expire, so lookups are dictionary reads.
     """
-    
-    def __init__(self):
+
+    def __init__(
+        self,
+        credential_sources: list = None,
+        credential=None,
+        ttl_seconds: float = DEFAULT_SECRET_TTL_SECONDS,
+        secret_ttls: dict = None,
+        background_refresh: bool = True,
+    ):
+        """
+        Args:
+            credential_sources: DefaultAzureCredential sources to try, in its usual
+                order, e.g. ["managed_identity", "cli"]; the rest are never probed.
+                Defaults to KEY_VAULT_CREDENTIAL_SOURCES (comma separated) or all.
+            credential: Ready-made azure.identity credential (overrides credential_sources)
+            ttl_seconds: How long a fetched secret is served from memory
+            secret_ttls: Per-secret TTL overrides, e.g. {"LANGUAGE-KEY": 300}
+            background_refresh: Re-fetch cached secrets before they expire
+
+        Example:
+            kv = KeyVaultConfig(credential_sources=["managed_identity"])
+            kv.prefetch(["LANGUAGE-ENDPOINT", "LANGUAGE-KEY"])
+            key = kv.get_credential("LANGUAGE-KEY")
+        """
         load_dotenv()
-        
+
+        self.ttl_seconds = ttl_seconds
+        self.secret_ttls = dict(secret_ttls or {})
+        self.background_refresh = background_refresh
+        self._cache = {}  # name -> (value, expires_at on the monotonic clock, effective ttl)
+        self._misses = {}  # name -> monotonic time until which a failed fetch is not retried
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._refresher = None
+
         # Try Key Vault first
         vault_url = os.getenv("KEY_VAULT_URL", "https://kv-healthcare-ai102.vault.azure.net/")
-        
+
         try:
-            credential = DefaultAzureCredential()
-            self.kv_client = SecretClient(vault_url=vault_url, credential=credential)
-            
+            credential = credential or self._build_credential(credential_sources)
+            self.kv_client = keyvault_secrets.SecretClient(vault_url=vault_url, credential=credential)
+
             # Test connection
             _ = self.kv_client.list_properties_of_secrets(max_page_size=1)
-            
+
             self.use_keyvault = True
             print("✅ Using Azure Key Vault for credentials")
-        
+
         except Exception as e:
             self.use_keyvault = False
             print(f"⚠️  Key Vault unavailable, using .env: {str(e)[:50]}")
-    
+
+    @staticmethod
+    def _build_credential(credential_sources: list = None):
+        if credential_sources is None:
+            configured = os.getenv("KEY_VAULT_CREDENTIAL_SOURCES")
+            if configured:
+                credential_sources = [s.strip() for s in configured.split(",") if s.strip()]
+        if credential_sources is None:
+            return identity.DefaultAzureCredential()
+
+        unknown = set(credential_sources) - set(CREDENTIAL_SOURCES)
+        if unknown:
+            raise ValueError(f"Unknown credential sources {sorted(unknown)}; choose from {list(CREDENTIAL_SOURCES)}")
+        excluded = {flag: source not in credential_sources for source, flag in CREDENTIAL_SOURCES.items()}
+        return identity.DefaultAzureCredential(**excluded)
+
+    def _ttl_for(self, key_name: str, secret) -> float:
+        ttl = self.secret_ttls.get(key_name, self.ttl_seconds)
+        # Never serve a secret past its own expiry date in Key Vault
+        expires_on = getattr(secret.properties, "expires_on", None)
+        if expires_on is not None:
+            ttl = min(ttl, max(0.0, (expires_on - datetime.now(timezone.utc)).total_seconds()))
+        return ttl
+
+    def _fetch(self, key_name: str):
+        """Read a secret from Key Vault and cache it; None if that fails"""
+        try:
+            secret = self.kv_client.get_secret(key_name)
+        except Exception as e:
+            print(f"⚠️  Key Vault fetch failed for {key_name}: {str(e)[:50]}")
+            return None
+
+        # The TTL may be capped by the secret's own expiry; keep the capped one
+        # so the refresher plans from what was actually applied
+        ttl = self._ttl_for(key_name, secret)
+        with self._lock:
+            self._cache[key_name] = (secret.value, time.monotonic() + ttl, ttl)
+            self._misses.pop(key_name, None)
+        self._start_refresher()
+        return secret.value
+
     def get_credential(self, key_name: str) -> str:
         """
         Get credential from Key Vault or .env
-        
+
         Args:
             key_name: Name of the secret (e.g., 'LANGUAGE-KEY')
-        
+
         Returns:
             Secret value
         """
-        # Try Key Vault
-        if self.use_keyvault:
-            try:
-                secret = self.kv_client.get_secret(key_name)
-                return secret.value
-            except Exception as e:
-                print(f"⚠️  Key Vault fetch failed for {key_name}: {str(e)[:50]}")
-        
+        # Hot path: a fresh cached value
+        entry = self._cache.get(key_name)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+
+        # Try Key Vault, unless it just failed for this name (missing secret,
+        # no access, vault down): callers without the secret would otherwise
+        # pay a round trip and a warning on every lookup
+        if self.use_keyvault and self._misses.get(key_name, 0.0) <= time.monotonic():
+            value = self._fetch(key_name)
+            if value is not None:
+                return value
+            with self._lock:
+                self._misses[key_name] = time.monotonic() + MISS_TTL_SECONDS
+        if entry is not None:
+            # Key Vault is unreachable right now; a stale value beats none
+            return entry[0]
+
         # Fallback to .env
         env_value = os.getenv(key_name.replace("-", "_"))  # LANGUAGE-KEY → LANGUAGE_KEY
         if not env_value:
             env_value = os.getenv(key_name)  # Try original format
-        
+
         return env_value
 
+    def prefetch(self, key_names: list, max_workers: int = 8) -> dict:
+        """
+        Fetch several secrets at once, e.g. at startup, so later lookups hit the cache
+
+        Returns:
+            {key_name: value} (values fall back to .env like get_credential)
+        """
+        key_names = list(key_names)
+        if not self.use_keyvault or not key_names:
+            return {name: self.get_credential(name) for name in key_names}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(key_names))) as executor:
+            return dict(zip(key_names, executor.map(self.get_credential, key_names)))
+
+    def _start_refresher(self) -> None:
+        if not self.background_refresh:
+            return
+        with self._lock:
+            if self._refresher is None:
+                self._refresher = threading.Thread(target=self._refresh_loop, name="keyvault-refresh", daemon=True)
+                self._refresher.start()
+        # A new secret may expire sooner than the refresher planned for
+        self._wake.set()
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.is_set():
+            # Clear before reading the cache, so a wake-up for an entry added
+            # after the snapshot is not lost
+            self._wake.clear()
+            now = time.monotonic()
+            with self._lock:
+                entries = dict(self._cache)
+
+            next_check = now + MAX_REFRESH_SLEEP_SECONDS
+            for key_name, (_, expires_at, ttl) in entries.items():
+                if ttl <= 0:
+                    # Already expired in Key Vault; refetching would spin
+                    continue
+                refresh_at = expires_at - ttl * REFRESH_MARGIN
+                if refresh_at <= now:
+                    # On failure the old value stays until it expires; retry soon
+                    if self._fetch(key_name) is None:
+                        next_check = min(next_check, now + 5)
+                else:
+                    next_check = min(next_check, refresh_at)
+
+            self._wake.wait(max(0.0, next_check - time.monotonic()))
+
+    def close(self) -> None:
+        """Stop the background refresh thread"""
+        self._stop.set()
+        self._wake.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout=5)
+
 
 # Quick test
 if __name__ == "__main__":
     kv = KeyVaultConfig()
-    
+
+    kv.prefetch(["LANGUAGE-ENDPOINT", "LANGUAGE-KEY"])
     endpoint = kv.get_credential("LANGUAGE-ENDPOINT")
     key = kv.get_credential("LANGUAGE-KEY")
-    
+
     if endpoint and key:
         print(f"✅ Endpoint: {endpoint[:30]}...")
         print(f"✅ Key: {key[:10]}...{key[-5:]}")
     else:
-        print("❌ Credentials not found")
\ No newline at end of file
+        print("❌ Credentials not found")
@@ -0,0 +1,387 @@
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+
+
+# Languages offered in the UI; anything else is left to the /detect endpoint
+SUPPORTED_LANGUAGES = ("en", "tr", "de", "fr", "es", "ar", "it")
+
+# Only the start of long inputs is profiled; that is plenty to tell languages apart
+MAX_SAMPLE_CHARS = 1000
+
+# Bundled training text, one short clinical/general paragraph set per language.
+# Profiles are built from it on first use, so no data files need to ship.
+_TRAINING_TEXT = {
+    "en": """
+The patient is a 54-year-old man with a history of type 2 diabetes and high blood pressure.
+He was admitted to the hospital with chest pain and shortness of breath that started this morning.
+The doctor prescribed metformin twice daily and asked him to check his blood sugar every day.
+Vital signs are stable and the heart rate is normal. There is no fever and the lungs are clear.
+She reports that the pain gets worse when she walks and improves with rest.
+Follow-up in the clinic in two weeks with the results of the laboratory tests.
+We discussed the risks and benefits of the treatment and the patient agrees with the plan.
+Please call the office if the symptoms return or if you have any questions about your medication.
+The child has been coughing for three days and has not been eating well since Monday.
+History of present illness: the patient was found at home by his wife, who called the ambulance.
+Reason for visit: cough and fever for one week. Assessment and plan: start antibiotics, review in seven days.
+Medications: lisinopril daily, insulin at night. Allergies: none known. Social history: smoker, drinks alcohol on weekends.
+Physical exam: alert and oriented, abdomen soft and non-tender. Discharged home in good condition with instructions.
+Diagnosis: acute bronchitis. Treatment: rest, fluids and an inhaler as needed. Referred to the lung specialist.
+Chief complaint: headache and dizziness for two days. Blood pressure raised on arrival, recheck in one hour.
+Past medical history: asthma since childhood, appendix removed, no known drug allergies.
+Plan: continue current medications, drink more water and return if the pain gets worse.
+Lab results within normal range except for a mildly raised cholesterol. Repeat the tests in three months.
+Admitted to the intensive care unit overnight for monitoring of respiratory distress.
+Routine yearly physical; weight and body mass index are recorded at every visit.
+Discussed diet and exercise; advised a lifestyle change and weight loss before starting any new medication.
+Orders: chest X-ray, complete blood count, blood cultures and intravenous fluids.
+Vital signs: temperature, pulse, respiratory rate and oxygen saturation on room air.
+Secondary diagnosis: kidney failure with reduced urine output. Kidney specialist consulted.
+Contact details and the date of the next appointment were given to the patient at discharge.
+The nurse gave the evening dose and checked the blood sugar again.
+Pain score four out of ten, better after the first dose of the medication.
+Impression: stable condition, low risk. Recommend follow-up with the family doctor.
+Patient education provided regarding side effects, warning signs and when to seek emergency care.
+Current smoker, advised to quit. Counseling and nicotine replacement offered.
+Referral to cardiology for further evaluation of palpitations and an irregular heart rhythm.
+Results reviewed with the patient by phone; she will come back next month for a recheck.
+""",
+    "tr": """
+Hasta, tip 2 diyabet ve yüksek tansiyon öyküsü olan 54 yaşında bir erkektir.
+Bu sabah başlayan göğüs ağrısı ve nefes darlığı şikayetiyle hastaneye yatırıldı.
+Doktor günde iki kez metformin reçete etti ve her gün kan şekerini ölçmesini istedi.
+Yaşamsal bulgular stabil ve kalp hızı normal. Ateş yok ve akciğerler temiz.
+Yürüdüğünde ağrının arttığını ve dinlenince azaldığını belirtiyor.
+Laboratuvar sonuçları ile iki hafta sonra kontrole gelmesi önerildi.
+Tedavinin riskleri ve faydaları konuşuldu, hasta plana onay verdi.
+Şikayetleriniz tekrar ederse veya ilacınızla ilgili sorularınız olursa lütfen bizi arayın.
+Çocuk üç gündür öksürüyor ve pazartesiden beri iyi beslenemiyor.
+Şimdiki hastalık öyküsü: hasta evde eşi tarafından bulundu, eşi ambulans çağırdı.
+Başvuru nedeni: bir haftadır öksürük ve ateş. Değerlendirme ve plan: antibiyotik başlandı, yedi gün sonra kontrol.
+İlaçlar: her gün lisinopril, gece insülin. Alerjiler: bilinen yok. Sosyal öykü: sigara içiyor, hafta sonları alkol kullanıyor.
+Fizik muayene: bilinci açık, koopere; karın yumuşak, hassasiyet yok. Önerilerle birlikte iyi durumda taburcu edildi.
+Tanı: akut bronşit. Tedavi: istirahat, bol sıvı ve gerektiğinde inhaler. Göğüs hastalıkları uzmanına yönlendirildi.
+Başvuru şikayeti: iki gündür baş ağrısı ve baş dönmesi. Gelişte tansiyon yüksek, bir saat sonra tekrar ölçülecek.
+Özgeçmiş: çocukluktan beri astım, apandisit ameliyatı, bilinen ilaç alerjisi yok.
+Kan tahlilleri normal sınırlarda, yalnızca kolesterol hafif yüksek. Üç ay sonra tekrarlanacak.
+Solunum sıkıntısı nedeniyle takip için yoğun bakım ünitesine yatırıldı.
+Öneriler: yaşam tarzı değişikliği, düzenli egzersiz ve yeni ilaca başlamadan önce kilo vermesi.
+İstemler: akciğer grafisi, tam kan sayımı, kan kültürü ve serum tedavisi.
+Yaşam bulguları: ateş, nabız, solunum sayısı ve oda havasında oksijen satürasyonu.
+Hemşire akşam dozunu verdi ve kan şekerini yeniden ölçtü.
+Çarpıntı ve ritim bozukluğunun ileri değerlendirmesi için kardiyolojiye yönlendirildi.
+Sonuçlar hastayla telefonda görüşüldü; gelecek ay kontrole gelecek.
+""",
+    "de": """
+Der Patient ist ein 54-jähriger Mann mit Diabetes Typ 2 und Bluthochdruck in der Vorgeschichte.
+Er wurde mit Brustschmerzen und Atemnot, die heute Morgen begonnen haben, ins Krankenhaus aufgenommen.
+Der Arzt verschrieb zweimal täglich Metformin und bat ihn, jeden Tag seinen Blutzucker zu messen.
+Die Vitalzeichen sind stabil und die Herzfrequenz ist normal. Kein Fieber, die Lunge ist frei.
+Sie berichtet, dass die Schmerzen beim Gehen stärker werden und sich in Ruhe bessern.
+Kontrolle in der Ambulanz in zwei Wochen mit den Ergebnissen der Laboruntersuchungen.
+Wir haben die Risiken und den Nutzen der Behandlung besprochen und der Patient ist einverstanden.
+Bitte rufen Sie die Praxis an, wenn die Beschwerden wiederkommen oder Sie Fragen zu Ihren Medikamenten haben.
+Das Kind hustet seit drei Tagen und isst seit Montag nicht mehr richtig.
+Aktuelle Anamnese: Der Patient wurde von seiner Frau zu Hause gefunden, die den Rettungsdienst rief.
+Vorstellungsgrund: Husten und Fieber seit einer Woche. Beurteilung und Procedere: Beginn einer Antibiose, Wiedervorstellung in sieben Tagen.
+Medikation: Lisinopril täglich, Insulin zur Nacht. Allergien: keine bekannt. Sozialanamnese: Raucher, trinkt am Wochenende Alkohol.
+Körperliche Untersuchung: wach und orientiert, Bauch weich, kein Druckschmerz. Entlassung nach Hause in gutem Zustand.
+Diagnose: akute Bronchitis. Therapie: Schonung, viel trinken und bei Bedarf ein Inhalator. Überweisung an den Lungenfacharzt.
+Aufnahmegrund: Kopfschmerzen und Schwindel seit zwei Tagen. Blutdruck bei Aufnahme erhöht, Kontrolle in einer Stunde.
+Vorerkrankungen: Asthma seit der Kindheit, Blinddarmoperation, keine bekannten Arzneimittelallergien.
+Laborwerte im Normbereich bis auf ein leicht erhöhtes Cholesterin. Wiederholung der Untersuchung in drei Monaten.
+Aufnahme auf die Intensivstation zur Überwachung bei Atemnot.
+Empfehlung: Umstellung der Ernährung, mehr Bewegung und Gewichtsabnahme vor Beginn einer neuen Medikation.
+Anordnungen: Röntgen des Thorax, Blutbild, Blutkulturen und Infusionen.
+Vitalparameter: Temperatur, Puls, Atemfrequenz und Sauerstoffsättigung unter Raumluft.
+Die Pflegekraft hat die Abenddosis gegeben und den Blutzucker erneut gemessen.
+Überweisung zur Kardiologie zur weiteren Abklärung von Herzrasen und Rhythmusstörungen.
+Der Befund wurde telefonisch mit der Patientin besprochen; sie kommt nächsten Monat zur Kontrolle.
+""",
+    "fr": """
+Le patient est un homme de 54 ans avec des antécédents de diabète de type 2 et d'hypertension artérielle.
+Il a été hospitalisé pour une douleur thoracique et un essoufflement qui ont commencé ce matin.
+Le médecin a prescrit de la metformine deux fois par jour et lui a demandé de contrôler sa glycémie chaque jour.
+Les signes vitaux sont stables et la fréquence cardiaque est normale. Pas de fièvre, les poumons sont clairs.
+Elle rapporte que la douleur s'aggrave à la marche et s'améliore au repos.
+Suivi à la consultation dans deux semaines avec les résultats des examens de laboratoire.
+Nous avons discuté des risques et des bénéfices du traitement et le patient est d'accord avec le plan.
+Veuillez appeler le cabinet si les symptômes reviennent ou si vous avez des questions sur vos médicaments.
+L'enfant tousse depuis trois jours et ne mange pas bien depuis lundi.
+Histoire de la maladie : le patient a été retrouvé à la maison par sa femme, qui a appelé l'ambulance.
+Motif de consultation : toux et fièvre depuis une semaine. Évaluation et conduite à tenir : début des antibiotiques, revoir dans sept jours.
+Traitement habituel : lisinopril le matin, insuline le soir. Allergies : aucune connue. Mode de vie : fumeur, boit de l'alcool le week-end.
+Examen clinique : conscient et orienté, abdomen souple et indolore. Retour à domicile en bon état avec des consignes.
+Diagnostic : bronchite aiguë. Traitement : repos, boissons abondantes et un inhalateur si besoin. Adressé au pneumologue.
+Motif d'admission : céphalées et vertiges depuis deux jours. Tension artérielle élevée à l'arrivée, à recontrôler dans une heure.
+Antécédents : asthme depuis l'enfance, appendicectomie, pas d'allergie médicamenteuse connue.
+Bilan biologique normal sauf un cholestérol légèrement élevé. Bilan à refaire dans trois mois.
+Admis en réanimation pour surveillance d'une détresse respiratoire.
+Recommandations : changement du mode de vie, activité physique et perte de poids avant un nouveau traitement.
+Prescriptions : radiographie du thorax, numération formule sanguine, hémocultures et perfusion.
+Constantes : température, pouls, fréquence respiratoire et saturation en oxygène à l'air ambiant.
+L'infirmière a donné la dose du soir et a recontrôlé la glycémie.
+Adressé en cardiologie pour le bilan de palpitations et d'un trouble du rythme.
+Résultats expliqués à la patiente par téléphone ; elle reviendra le mois prochain pour un contrôle.
+""",
+    "es": """
+El paciente es un hombre de 54 años con antecedentes de diabetes tipo 2 y presión arterial alta.
+Fue ingresado en el hospital por dolor en el pecho y dificultad para respirar que comenzaron esta mañana.
+El médico le recetó metformina dos veces al día y le pidió que se controlara el azúcar en sangre todos los días.
+Los signos vitales son estables y la frecuencia cardíaca es normal. No hay fiebre y los pulmones están limpios.
+Ella refiere que el dolor empeora al caminar y mejora con el reposo.
+Control en la consulta en dos semanas con los resultados de los análisis de laboratorio.
+Hablamos de los riesgos y beneficios del tratamiento y el paciente está de acuerdo con el plan.
+Por favor llame a la consulta si los síntomas vuelven o si tiene preguntas sobre su medicación.
+El niño tiene tos desde hace tres días y no come bien desde el lunes.
+Enfermedad actual: el paciente fue encontrado en su casa por su esposa, que llamó a la ambulancia.
+Motivo de consulta: tos y fiebre desde hace una semana. Valoración y plan: iniciar antibióticos, revisión en siete días.
+Medicación: lisinopril cada día, insulina por la noche. Alergias: ninguna conocida. Hábitos: fumador, bebe alcohol los fines de semana.
+Exploración física: consciente y orientado, abdomen blando y depresible, no doloroso. Alta a domicilio en buen estado con indicaciones.
+Diagnóstico: bronquitis aguda. Tratamiento: reposo, abundantes líquidos y un inhalador si lo necesita. Derivado al neumólogo.
+Motivo de ingreso: dolor de cabeza y mareo desde hace dos días. Tensión arterial elevada a la llegada, nuevo control en una hora.
+Antecedentes personales: asma desde la infancia, apendicectomía, sin alergias medicamentosas conocidas.
+Analítica dentro de la normalidad salvo un colesterol ligeramente elevado. Repetir en tres meses.
+Ingresa en la unidad de cuidados intensivos para vigilancia por insuficiencia respiratoria.
+Recomendaciones: cambios en el estilo de vida, ejercicio y pérdida de peso antes de empezar un nuevo fármaco.
+Órdenes: radiografía de tórax, hemograma, hemocultivos y sueroterapia.
+Constantes: temperatura, pulso, frecuencia respiratoria y saturación de oxígeno basal.
+La enfermera administró la dosis de la noche y volvió a medir la glucosa.
+Se deriva a cardiología para estudio de palpitaciones y alteraciones del ritmo.
+Se comentan los resultados con la paciente por teléfono; volverá el mes que viene para control.
+""",
+    "ar": """
+المريض رجل يبلغ من العمر 54 عاما ولديه تاريخ من مرض السكري من النوع الثاني وارتفاع ضغط الدم.
+تم إدخاله إلى المستشفى بسبب ألم في الصدر وضيق في التنفس بدأ هذا الصباح.
+وصف الطبيب الميتفورمين مرتين يوميا وطلب منه فحص نسبة السكر في الدم كل يوم.
+العلامات الحيوية مستقرة ومعدل ضربات القلب طبيعي. لا توجد حمى والرئتان سليمتان.
+تفيد بأن الألم يزداد عند المشي ويتحسن مع الراحة.
+المتابعة في العيادة بعد أسبوعين مع نتائج التحاليل المخبرية.
+ناقشنا مخاطر وفوائد العلاج والمريض موافق على الخطة.
+يرجى الاتصال بالعيادة إذا عادت الأعراض أو إذا كانت لديك أسئلة حول دوائك.
+سبب الزيارة: صداع ودوخة منذ يومين. ضغط الدم مرتفع عند الوصول ويعاد قياسه بعد ساعة.
+التاريخ المرضي: ربو منذ الطفولة، استئصال الزائدة الدودية، لا توجد حساسية معروفة للأدوية.
+نتائج التحاليل ضمن المعدل الطبيعي باستثناء ارتفاع بسيط في الكوليسترول. تعاد التحاليل بعد ثلاثة أشهر.
+أدخل المريض إلى وحدة العناية المركزة لمراقبة ضيق التنفس.
+التوصيات: تغيير نمط الحياة وممارسة الرياضة وإنقاص الوزن قبل البدء بدواء جديد.
+العلامات الحيوية: الحرارة والنبض ومعدل التنفس وتشبع الأكسجين في هواء الغرفة.
+أعطت الممرضة الجرعة المسائية وأعادت قياس السكر في الدم.
+تمت إحالة المريضة إلى قسم القلب لتقييم الخفقان واضطراب النظم.
+""",
+    "it": """
+Il paziente è un uomo di 54 anni con una storia di diabete di tipo 2 e pressione alta.
+È stato ricoverato in ospedale per dolore toracico e difficoltà respiratoria iniziati questa mattina.
+Il medico ha prescritto metformina due volte al giorno e gli ha chiesto di controllare la glicemia ogni giorno.
+I parametri vitali sono stabili e la frequenza cardiaca è normale. Non c'è febbre e i polmoni sono liberi.
+Riferisce che il dolore peggiora quando cammina e migliora con il riposo.
+Controllo in ambulatorio tra due settimane con i risultati degli esami di laboratorio.
+Abbiamo discusso i rischi e i benefici della terapia e il paziente è d'accordo con il piano.
+Si prega di chiamare lo studio se i sintomi ritornano o se ha domande sui suoi farmaci.
+Il bambino tossisce da tre giorni e non mangia bene da lunedì.
+Anamnesi attuale: il paziente è stato trovato a casa dalla moglie, che ha chiamato l'ambulanza.
+Motivo della visita: tosse e febbre da una settimana. Valutazione e piano: iniziare antibiotici, rivalutazione tra sette giorni.
+Terapia: lisinopril ogni giorno, insulina la sera. Allergie: nessuna nota. Abitudini: fumatore, beve alcolici nel fine settimana.
+Esame obiettivo: vigile e orientato, addome trattabile e non dolente. Dimesso a domicilio in buone condizioni con indicazioni.
+Diagnosi: bronchite acuta. Terapia: riposo, molti liquidi e un inalatore al bisogno. Inviato allo specialista pneumologo.
+Motivo del ricovero: cefalea e vertigini da due giorni. Pressione arteriosa elevata all'arrivo, ricontrollare tra un'ora.
+Anamnesi patologica remota: asma dall'infanzia, appendicectomia, nessuna allergia a farmaci nota.
+Esami del sangue nella norma tranne un colesterolo lievemente aumentato. Ripetere tra tre mesi.
+Ricoverato in terapia intensiva per monitoraggio dell'insufficienza respiratoria.
+Raccomandazioni: modifica dello stile di vita, attività fisica e calo di peso prima di iniziare un nuovo farmaco.
+Richieste: radiografia del torace, emocromo, emocolture e infusione di liquidi.
+Parametri: temperatura, polso, frequenza respiratoria e saturazione di ossigeno in aria ambiente.
+L'infermiera ha somministrato la dose serale e ha ricontrollato la glicemia.
+Inviato in cardiologia per approfondimento di palpitazioni e disturbi del ritmo.
+Risultati comunicati alla paziente per telefono; tornerà il mese prossimo per un controllo.
+""",
+}
+
+# Languages that are easily mistaken for a supported one. They are profiled
+# only so that text in them wins against its own profile and is left to the
+# /detect endpoint instead of being answered as Spanish, German or Arabic.
+_OTHER_LANGUAGES_TEXT = {
+    "pt": """
+O doente é um homem de 60 anos com antecedentes de asma e colesterol elevado.
+Foi internado no hospital por dor no peito e falta de ar que começaram ontem à noite.
+O médico receitou um comprimido por dia e pediu para medir a pressão arterial em casa.
+Os sinais vitais estão estáveis, sem febre, e os pulmões estão limpos.
+Consulta de seguimento daqui a duas semanas com os resultados das análises.
+A criança está com tosse há três dias e não come bem desde segunda-feira.
+Recomendações: mudança do estilo de vida, exercício e perda de peso. Encaminhado para a cardiologia.
+A enfermeira deu a dose da noite e voltou a medir o açúcar no sangue.
+Os sinais vitais são estáveis e a frequência cardíaca é normal. Não há sinais de infeção.
+Ela refere que a dor piora quando caminha e melhora com o repouso.
+Discutimos os riscos e os benefícios do tratamento e o doente concorda com o plano.
+Por favor ligue para o centro de saúde se os sintomas voltarem ou se tiver dúvidas sobre a medicação.
+História da doença atual: o doente foi encontrado em casa pela esposa, que chamou a ambulância.
+Motivo da consulta: tosse e febre há uma semana. Avaliação e plano: iniciar antibiótico, reavaliar em sete dias.
+Medicação habitual: lisinopril de manhã, insulina à noite. Alergias: nenhuma conhecida. Fumador.
+Exame objetivo: consciente e orientado, abdómen mole e depressível. Alta para o domicílio em bom estado.
+Diagnóstico: bronquite aguda. Tratamento: repouso, muitos líquidos e um inalador quando necessário.
+Análises dentro dos valores normais, exceto o colesterol ligeiramente aumentado. Repetir daqui a três meses.
+Internado na unidade de cuidados intensivos para vigilância da insuficiência respiratória.
+Os resultados foram explicados à doente por telefone; voltará no próximo mês para controlo.
+A paciente tem hipertensão e toma a medicação todos os dias, mas não mede a pressão em casa.
+O paciente não tem alergias e a vacinação está em dia. Recomendações: alimentação saudável e caminhadas.
+""",
+    "ca": """
+El pacient és un home de 60 anys amb antecedents d'asma i colesterol alt.
+Va ingressar a l'hospital per dolor al pit i dificultat per respirar que van començar ahir a la nit.
+El metge li va receptar una pastilla al dia i li va demanar que es prengués la pressió a casa.
+Les constants vitals són estables, no té febre i els pulmons estan nets.
+Control a la consulta d'aquí a dues setmanes amb els resultats de les anàlisis.
+El nen fa tres dies que tus i no menja bé des de dilluns.
+Recomanacions: canvis en l'estil de vida, exercici i pèrdua de pes. Derivat a cardiologia.
+La infermera li va donar la dosi del vespre i li va tornar a mesurar el sucre a la sang.
+La freqüència cardíaca és normal i no hi ha signes d'infecció.
+Diu que el dolor empitjora quan camina i millora amb el repòs.
+Hem parlat dels riscos i els beneficis del tractament i el pacient hi està d'acord.
+Si us plau, truqueu al centre si els símptomes tornen o si teniu dubtes sobre la medicació.
+Malaltia actual: el pacient va ser trobat a casa per la seva dona, que va trucar a l'ambulància.
+Motiu de consulta: tos i febre des de fa una setmana. Valoració i pla: començar antibiòtics, revisió d'aquí a set dies.
+Medicació habitual: lisinopril cada dia, insulina a la nit. Al·lèrgies: cap de coneguda. Fumador.
+Exploració física: conscient i orientat, abdomen tou i no dolorós. Alta a domicili en bon estat.
+Diagnòstic: bronquitis aguda. Tractament: repòs, molts líquids i un inhalador si cal.
+Analítica dins de la normalitat excepte el colesterol lleugerament elevat. Repetir d'aquí a tres mesos.
+Ingressa a la unitat de cures intensives per vigilància de la insuficiència respiratòria.
+Es comenten els resultats amb la pacient per telèfon; tornarà el mes que ve per a control.
+""",
+    "ro": """
+Pacientul este un bărbat de 60 de ani cu astm și colesterol crescut în antecedente.
+A fost internat în spital pentru durere în piept și dificultăți de respirație care au început aseară.
+Medicul i-a prescris o tabletă pe zi și i-a cerut să își măsoare tensiunea acasă.
+Semnele vitale sunt stabile, fără febră, plămânii sunt curați.
+Control la cabinet peste două săptămâni cu rezultatele analizelor.
+Copilul tușește de trei zile și nu mănâncă bine de luni.
+""",
+    "nl": """
+De patiënt is een man van 60 jaar met astma en een verhoogd cholesterol in de voorgeschiedenis.
+Hij werd opgenomen in het ziekenhuis met pijn op de borst en kortademigheid sinds gisteravond.
+De arts schreef één tablet per dag voor en vroeg hem thuis zijn bloeddruk te meten.
+De vitale functies zijn stabiel, geen koorts, de longen zijn schoon.
+Controle op de polikliniek over twee weken met de uitslagen van het bloedonderzoek.
+Het kind hoest al drie dagen en eet sinds maandag niet goed.
+Advies: leefstijl aanpassen, meer bewegen en afvallen. Verwezen naar de cardioloog.
+De verpleegkundige gaf de avonddosis en mat de bloedsuiker opnieuw.
+""",
+    "sv": """
+Patienten är en 60-årig man med astma och högt kolesterol sedan tidigare.
+Han lades in på sjukhuset med bröstsmärta och andfåddhet som började i går kväll.
+Läkaren skrev ut en tablett om dagen och bad honom mäta blodtrycket hemma.
+Vitalparametrarna är stabila, ingen feber och lungorna är fria.
+Återbesök på mottagningen om två veckor med provsvaren.
+Barnet har hostat i tre dagar och äter inte ordentligt sedan i måndags.
+Råd: ändrade levnadsvanor, mer motion och viktnedgång. Remiss till kardiologen.
+Sjuksköterskan gav kvällsdosen och mätte blodsockret igen.
+""",
+    "pl": """
+Pacjent to 60-letni mężczyzna z astmą i podwyższonym cholesterolem w wywiadzie.
+Został przyjęty do szpitala z bólem w klatce piersiowej i dusznością, które zaczęły się wczoraj wieczorem.
+Lekarz przepisał jedną tabletkę dziennie i poprosił o mierzenie ciśnienia w domu.
+Parametry życiowe są stabilne, bez gorączki, płuca czyste.
+Kontrola w poradni za dwa tygodnie z wynikami badań.
+Dziecko kaszle od trzech dni i od poniedziałku źle je.
+Zalecenia: zmiana stylu życia, więcej ruchu i redukcja masy ciała. Skierowany do kardiologa.
+Pielęgniarka podała wieczorną dawkę i ponownie zmierzyła poziom cukru we krwi.
+""",
+    "fa": """
+بیمار مردی ۶۰ ساله با سابقه آسم و کلسترول بالا است.
+او به دلیل درد قفسه سینه و تنگی نفس که از دیشب شروع شده در بیمارستان بستری شد.
+پزشک روزی یک قرص تجویز کرد و از او خواست فشار خونش را در خانه اندازه بگیرد.
+علائم حیاتی پایدار است، تب ندارد و ریه‌ها پاک هستند.
+پیگیری در درمانگاه دو هفته دیگر با نتایج آزمایش‌ها.
+کودک سه روز است سرفه می‌کند و از دوشنبه خوب غذا نمی‌خورد.
+""",
+    "ur": """
+مریض ساٹھ سالہ آدمی ہے جسے دمہ اور زیادہ کولیسٹرول کی شکایت رہی ہے۔
+اسے کل رات سے سینے میں درد اور سانس پھولنے کی وجہ سے ہسپتال میں داخل کیا گیا۔
+ڈاکٹر نے روزانہ ایک گولی تجویز کی اور گھر پر بلڈ پریشر چیک کرنے کو کہا۔
+اہم علامات مستحکم ہیں، بخار نہیں ہے اور پھیپھڑے صاف ہیں۔
+دو ہفتے بعد ٹیسٹ کے نتائج کے ساتھ کلینک میں دوبارہ معائنہ۔
+بچے کو تین دن سے کھانسی ہے اور وہ پیر سے ٹھیک سے نہیں کھا رہا۔
+""",
+}
+
+# Add-alpha smoothing for trigrams a language profile has never seen
+SMOOTHING = 0.5
+
+# Log-likelihood lead (in nats) of the best language over the runner-up at
+# which confidence reaches 1 - 1/e. Trigrams overlap, so each character is
+# counted about three times and the raw lead overstates the evidence.
+CONFIDENCE_SCALE = 6.0
+
+_NON_LETTERS = re.compile(r"[^\w']+|[\d_]+")
+_PLACEHOLDERS = re.compile(r"\[[A-Z_]+\]")
+# Addresses, links and codes such as HbA1c, SpO2 or Q12H say nothing about the language
+_NOT_PROSE = re.compile(r"\S+@\S+|(?:https?://|www\.)\S+|\w*\d\w*")
+_ACRONYMS = re.compile(r"\b[A-Z]{2,}\b")
+
+
+def _trigrams(text: str) -> Counter:
+    """Character trigram counts over lower-cased words padded with spaces"""
+    counts = Counter()
+    for word in _NON_LETTERS.sub(" ", text.lower()).split():
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            counts[padded[i:i + 3]] += 1
+    return counts
+
+
+def _prose(text: str) -> str:
+    """The part of text worth profiling: no placeholders, addresses, codes or acronyms"""
+    # Redaction placeholders are English whatever the note's language
+    sample = _NOT_PROSE.sub(" ", _PLACEHOLDERS.sub(" ", text[:MAX_SAMPLE_CHARS]))
+    # Acronyms (BP, ICU, LDL) are shared across languages; keep them only if
+    # the text is all capitals
+    without_acronyms = _ACRONYMS.sub(" ", sample)
+    return without_acronyms if _NON_LETTERS.sub("", without_acronyms) else sample
+
+
+@lru_cache(maxsize=1)
+def _profiles() -> dict:
+    """Per-language trigram log-probabilities plus the log-probability of an unseen trigram"""
+    texts = {**_TRAINING_TEXT, **_OTHER_LANGUAGES_TEXT}
+    counts = {lang: _trigrams(text) for lang, text in texts.items()}
+    vocabulary = set().union(*counts.values())
+    profiles = {}
+    for lang, grams in counts.items():
+        total = sum(grams.values()) + SMOOTHING * len(vocabulary)
+        profiles[lang] = (
+            {gram: math.log((c + SMOOTHING) / total) for gram, c in grams.items()},
+            math.log(SMOOTHING / total),
+        )
+    return profiles
+
+
+def identify_language(text: str) -> tuple:
+    """
+    Guess the language of text locally from character trigrams
+
+    Args:
+        text: Text to identify
+
+    Returns:
+        (language_code, confidence) where confidence is 0..1, or (None, 0.0)
+        when there is nothing to go on or the text looks like a language the
+        UI does not offer (Portuguese, Dutch, Persian, ...). Confidence grows
+        with the log-likelihood lead of the best language over the runner-up,
+        so short or mixed inputs come back low.
+
+    Example:
+        lang, confidence = identify_language("Patient has diabetes")
+    """
+    counts = _trigrams(_prose(text))
+    if not counts:
+        return None, 0.0
+
+    scores = []
+    for lang, (logprobs, unseen) in _profiles().items():
+        score = sum(c * logprobs.get(gram, unseen) for gram, c in counts.items())
+        scores.append((score, lang))
+    scores.sort(reverse=True)
+
+    (best, lang), (second, _) = scores[0], scores[1]
+    if lang not in SUPPORTED_LANGUAGES:
+        return None, 0.0
+    return lang, 1.0 - math.exp(-(best - second) / CONFIDENCE_SCALE)
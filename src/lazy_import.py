@@ -0,0 +1,38 @@
+import importlib
+import threading
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access
+    Lets heavy SDKs sit at module level (speechsdk.ResultReason, ...) while
+    only code paths that actually use them pay the import cost.
+
+    Example:
+        speechsdk = LazyModule("azure.cognitiveservices.speech")
+        ...
+        config = speechsdk.SpeechConfig(subscription=key, region=region)  # imported here
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
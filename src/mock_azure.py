@@ -0,0 +1,612 @@
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+from src.credentials import MemoryCredentialProvider
+from src.language_id import identify_language
+from src.lazy_import import LazyModule
+from src.pii_redactor import MAX_DOCUMENT_CHARS, MAX_DOCUMENTS_PER_REQUEST, MAX_HEALTHCARE_DOCUMENTS_PER_REQUEST
+from src.translator import MAX_CHARS_PER_REQUEST, MAX_TEXTS_PER_REQUEST
+
+speechsdk = LazyModule("azure.cognitiveservices.speech")
+
+MODEL_VERSION = "2021-06-01"
+HEALTH_MODEL_VERSION = "2022-03-01"
+
+# Lower-case term -> Text Analytics for Health category
+HEALTH_TERMS = {
+    "MedicationName": [
+        "atorvastatin", "aspirin", "albuterol", "spiriva", "ceftriaxone", "cephalexin",
+        "metformin", "lisinopril", "insulin", "ibuprofen", "amoxicillin", "oxygen",
+    ],
+    "Diagnosis": [
+        "acute respiratory failure", "hypertension", "htn", "hyperlipidemia", "copd",
+        "pneumonia", "diabetes", "prediabetic", "laceration", "asthma",
+    ],
+    "SymptomOrSign": [
+        "chest pain", "shortness of breath", "fever", "cough", "headache", "nausea",
+    ],
+    "TreatmentName": ["wound irrigation", "lifestyle modification", "closure"],
+    "ExaminationName": ["bp", "hr", "spo2", "hba1c", "ldl", "bmi", "vitals"],
+    "BodyStructure": ["right forearm", "forearm", "chest", "lungs"],
+    "Frequency": ["twice daily", "daily", "qd", "bid", "tid", "q12h", "prn"],
+    "RouteOrMode": ["iv", "po", "nc", "inhaler"],
+}
+
+FIRST_NAMES = [
+    "Mary", "Robert", "Sarah", "David", "Linda", "John", "James", "Michael",
+    "Jennifer", "Maria", "Ahmet", "Ayşe", "Mehmet", "Fatma",
+]
+
+PATTERNS = {
+    "Person": re.compile(
+        r"\b(?:Dr|Mr|Mrs|Ms)\.\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?"
+        r"|\b(?:" + "|".join(FIRST_NAMES) + r")\s+[A-Z][a-z]+"
+    ),
+    "Date": re.compile(r"\b\d{1,2}/\d{1,2}/\d{2,4}\b|\b\d{4}-\d{2}-\d{2}\b"),
+    "Duration": re.compile(r"\b\d+\s+(?:day|week|month|year|hour|minute)s?\b", re.IGNORECASE),
+    "Email": re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+\w"),
+    "USSocialSecurityNumber": re.compile(r"\b\d{3}-\d{2}-\d{4}\b"),
+    "PhoneNumber": re.compile(r"\+\d{1,3}(?:[ -]\d{3,4}){2,3}\b|\b\d{3}-\d{3}-\d{4}\b"),
+    "IPAddress": re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}\b"),
+    "URL": re.compile(r"https?://\S+|\bwww\.\S+"),
+    "Dosage": re.compile(r"\b\d+(?:\.\d+)?\s?(?:mg|mcg|g|ml|L|units?)\b"),
+}
+
+_HEALTH_PATTERN = re.compile(
+    r"\b(" + "|".join(sorted(
+        (re.escape(term) for terms in HEALTH_TERMS.values() for term in terms),
+        key=len,
+        reverse=True,
+    )) + r")\b",
+    re.IGNORECASE,
+)
+_HEALTH_CATEGORY = {term: category for category, terms in HEALTH_TERMS.items() for term in terms}
+
+CANNED_DICTATION = [
+    "Patient Mary Johnson was seen today for chest pain.",
+    "History of hypertension and hyperlipidemia.",
+    "Continue atorvastatin 20 mg daily and aspirin 81 mg daily.",
+    "Follow up with Dr. Anderson in cardiology clinic in 2 weeks.",
+]
+
+
+def _entity(match, category: str, confidence: float, subcategory: str = None) -> dict:
+    entity = {
+        "text": match.group(0),
+        "category": category,
+        "offset": match.start(),
+        "length": match.end() - match.start(),
+        "confidenceScore": confidence,
+    }
+    if subcategory:
+        entity["subcategory"] = subcategory
+    return entity
+
+
+def general_entities(text: str) -> list:
+    """Person and DateTime entities, like /entities/recognition/general"""
+    entities = [_entity(m, "Person", 0.98) for m in PATTERNS["Person"].finditer(text)]
+    entities += [_entity(m, "DateTime", 0.99, "Date") for m in PATTERNS["Date"].finditer(text)]
+    entities += [_entity(m, "DateTime", 0.8, "Duration") for m in PATTERNS["Duration"].finditer(text)]
+    return sorted(entities, key=lambda e: e["offset"])
+
+
+def pii_entities(text: str) -> list:
+    """Contact PII and person names, like /entities/recognition/pii"""
+    entities = [_entity(m, "Person", 0.95) for m in PATTERNS["Person"].finditer(text)]
+    taken = []
+    for category in ("Email", "URL", "USSocialSecurityNumber", "PhoneNumber", "IPAddress"):
+        for match in PATTERNS[category].finditer(text):
+            # An SSN also looks like a phone number; the first category wins
+            if any(start < match.end() and match.start() < end for start, end in taken):
+                continue
+            taken.append(match.span())
+            entities.append(_entity(match, category, 0.9))
+    return sorted(entities, key=lambda e: e["offset"])
+
+
+def health_entities(text: str) -> list:
+    """Lexicon and dosage matches, like Text Analytics for Health"""
+    entities = [
+        _entity(m, _HEALTH_CATEGORY[m.group(0).lower()], 0.9)
+        for m in _HEALTH_PATTERN.finditer(text)
+    ]
+    entities += [_entity(m, "Dosage", 0.95) for m in PATTERNS["Dosage"].finditer(text)]
+    return sorted(entities, key=lambda e: e["offset"])
+
+
+def redact_pii(text: str, entities: list) -> str:
+    chars = list(text)
+    for entity in entities:
+        for i in range(entity["offset"], entity["offset"] + entity["length"]):
+            chars[i] = "*"
+    return "".join(chars)
+
+
+def mock_translation(text: str, to_lang: str) -> str:
+    """Deterministic "translation": the text tagged with its target language"""
+    return f"[{to_lang}] {text}"
+
+
+class MockAzureServer:
+    """
+    Local stand-in for the Azure Language and Translator endpoints
+    Speaks enough of the Text Analytics v3.x REST API (general entities, PII,
+    health jobs) and Translator v3 (/translate, /detect) for PIIRedactor and
+    MedicalTranslator to run against it unchanged, with configurable latency,
+    errors and 429 throttling. Entities come from lexicons and regular
+    expressions, so the same text always gives the same entities; with a fixed
+    seed and one client thread the injected faults are reproducible too.
+
+    Example:
+        with MockAzureServer(latency=0.05, throttle_rate=0.1) as server:
+            redactor = PIIRedactor(api_version="v3.1", credentials=server.credentials())
+            translator = MedicalTranslator(credentials=server.credentials())
+            print(redactor.process_document("Patient Mary Johnson, DOB 07/22/1978."))
+            print(server.stats())
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+        job_seconds: float = 0.0,
+        poll_interval: float = 0.05,
+        seed: int = 0,
+        key: str = "mock-key",
+    ):
+        """
+        Args:
+            host, port: Address to listen on (port 0 picks a free port)
+            latency: Seconds added to every response
+            latency_jitter: Extra uniformly random latency, 0..latency_jitter seconds
+            error_rate: Share of requests answered with 500
+            throttle_rate: Share of requests answered with 429 and Retry-After
+            retry_after: Seconds sent in Retry-After with each 429 (rounded up to whole seconds)
+            job_seconds: How long a health job stays "running" before it succeeds
+            poll_interval: Poll delay (retry-after-ms) suggested to clients of health jobs
+            seed: Seed of the fault injector
+            key: Subscription key clients must send (Ocp-Apim-Subscription-Key)
+        """
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.job_seconds = job_seconds
+        self.poll_interval = poll_interval
+        self.key = key
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = Counter()
+        self._jobs = {}  # job id -> (created, documents response)
+        self._thread = None
+
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def credentials(self) -> MemoryCredentialProvider:
+        """Credential provider pointing every service at this server"""
+        return MemoryCredentialProvider({
+            "LANGUAGE_ENDPOINT": self.endpoint,
+            "LANGUAGE_KEY": self.key,
+            "TRANSLATOR_ENDPOINT": self.endpoint,
+            "TRANSLATOR_KEY": self.key,
+            "TRANSLATOR_REGION": "global",
+            "SPEECH_KEY": self.key,
+            "SPEECH_REGION": "local",
+        })
+
+    def start(self) -> "MockAzureServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-azure", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def stats(self) -> dict:
+        """Request counters: per route, plus "throttled" and "errors" """
+        with self._lock:
+            return dict(self._stats)
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def fault(self):
+        """429, 500 or None for the next request, after the configured latency"""
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.latency_jitter)
+            roll = self._random.random()
+        if delay:
+            time.sleep(delay)
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 500
+        return None
+
+    def create_job(self, response: dict) -> str:
+        job_id = str(uuid.uuid4())
+        with self._lock:
+            self._jobs[job_id] = (datetime.now(timezone.utc), response)
+        return job_id
+
+    def job(self, job_id: str):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def mock(self) -> MockAzureServer:
+        return self.server.mock
+
+    def _send(self, status: int, body=None, headers: dict = None) -> None:
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("X-RequestId", str(uuid.uuid4()))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: int, code, message: str, headers: dict = None) -> None:
+        self._send(status, {"error": {"code": code, "message": message}}, headers)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"null")
+
+    def _handle(self, method: str) -> None:
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        # Read the body even when failing the request, so keep-alive stays in sync
+        body = self._body() if method == "POST" else None
+        translator = url.path in ("/translate", "/detect")
+
+        if self.headers.get("Ocp-Apim-Subscription-Key") != self.mock.key:
+            self.mock.count("unauthorized")
+            return self._error(401, 401000 if translator else "401", "Access denied due to invalid subscription key.")
+
+        fault = self.mock.fault()
+        if fault == 429:
+            self.mock.count("throttled")
+            return self._error(
+                429,
+                429001 if translator else "429",
+                "Rate limit is exceeded.",
+                {"Retry-After": str(math.ceil(self.mock.retry_after))},
+            )
+        if fault == 500:
+            self.mock.count("errors")
+            return self._error(500, 500000 if translator else "InternalServerError", "Injected server error.")
+
+        if translator:
+            self.mock.count(url.path.lstrip("/"))
+            if url.path == "/translate":
+                return self._translate(body, query)
+            return self._detect(body)
+
+        match = re.fullmatch(r"/text/analytics/(v3\.[01])/(.+)", url.path)
+        route = match.group(2) if match else None
+        if route in ("entities/recognition/general", "entities/recognition/pii") and method == "POST":
+            self.mock.count(route)
+            return self._recognize(body, route.endswith("pii"))
+        if route == "entities/health/jobs" and method == "POST":
+            self.mock.count(route)
+            return self._start_health_job(body, match.group(1))
+        if route and route.startswith("entities/health/jobs/") and method == "GET":
+            self.mock.count("entities/health/jobs/{id}")
+            return self._health_job(route.rsplit("/", 1)[1])
+
+        self.mock.count("not_found")
+        return self._error(404, "404", f"Resource not found: {method} {url.path}")
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    # Text Analytics
+
+    def _documents(self, body, analyze) -> dict:
+        documents, errors = [], []
+        for doc in body["documents"]:
+            if len(doc["text"]) > MAX_DOCUMENT_CHARS:
+                errors.append({"id": doc["id"], "error": {
+                    "code": "InvalidArgument",
+                    "message": "Invalid document in request.",
+                    "innererror": {"code": "InvalidDocument", "message": "A document within the request was too large."},
+                }})
+                continue
+            documents.append({"id": doc["id"], "warnings": [], **analyze(doc["text"])})
+        return {"documents": documents, "errors": errors}
+
+    def _check_batch(self, body, limit: int) -> bool:
+        if len(body.get("documents", [])) > limit:
+            self._send(400, {"error": {
+                "code": "InvalidRequest",
+                "message": "Invalid document in request.",
+                "innererror": {
+                    "code": "InvalidDocumentBatch",
+                    "message": f"Batch request contains too many records. Max {limit} records are permitted.",
+                },
+            }})
+            return False
+        return True
+
+    def _recognize(self, body, pii: bool) -> None:
+        if not self._check_batch(body, MAX_DOCUMENTS_PER_REQUEST):
+            return
+
+        def analyze(text):
+            if not pii:
+                return {"entities": general_entities(text)}
+            entities = pii_entities(text)
+            return {"entities": entities, "redactedText": redact_pii(text, entities)}
+
+        response = self._documents(body, analyze)
+        self._send(200, {**response, "modelVersion": MODEL_VERSION})
+
+    def _start_health_job(self, body, version: str) -> None:
+        if not self._check_batch(body, MAX_HEALTHCARE_DOCUMENTS_PER_REQUEST):
+            return
+        response = self._documents(
+            body,
+            lambda text: {"entities": health_entities(text), "relations": []},
+        )
+        job_id = self.mock.create_job({**response, "modelVersion": HEALTH_MODEL_VERSION})
+        location = f"{self.mock.endpoint}/text/analytics/{version}/entities/health/jobs/{job_id}"
+        self._send(202, None, {
+            "Operation-Location": location,
+            "retry-after-ms": str(int(self.mock.poll_interval * 1000)),
+        })
+
+    def _health_job(self, job_id: str) -> None:
+        job = self.mock.job(job_id)
+        if job is None:
+            return self._error(404, "NotFound", f"Job {job_id} not found.")
+        created, response = job
+        now = datetime.now(timezone.utc)
+        running = (now - created).total_seconds() < self.mock.job_seconds
+        body = {
+            "jobId": job_id,
+            "createdDateTime": created.isoformat(),
+            "lastUpdateDateTime": now.isoformat(),
+            "expirationDateTime": (created + timedelta(days=1)).isoformat(),
+            "status": "running" if running else "succeeded",
+            "errors": [],
+        }
+        headers = {}
+        if running:
+            headers["retry-after-ms"] = str(int(self.mock.poll_interval * 1000))
+        else:
+            body["results"] = response
+        self._send(200, body, headers)
+
+    # Translator
+
+    @staticmethod
+    def _text(item: dict) -> str:
+        # Field names are case-insensitive in Translator; clients send "text" or "Text"
+        return item.get("text", item.get("Text", ""))
+
+    def _check_translator_body(self, body, to_langs: int = 1) -> bool:
+        chars = sum(len(self._text(item)) for item in body) * to_langs
+        if len(body) > MAX_TEXTS_PER_REQUEST or chars > MAX_CHARS_PER_REQUEST:
+            self._error(400, 400077, "The maximum request size has been exceeded.")
+            return False
+        return True
+
+    def _translate(self, body, query: dict) -> None:
+        to_langs = query.get("to", [])
+        if not to_langs:
+            return self._error(400, 400036, "The target language is not valid.")
+        if not self._check_translator_body(body, len(to_langs)):
+            return
+        from_lang = query.get("from", [None])[0]
+        results = []
+        for item in body:
+            text = self._text(item)
+            result = {"translations": [{"text": mock_translation(text, lang), "to": lang} for lang in to_langs]}
+            if not from_lang:
+                lang, confidence = identify_language(text)
+                result["detectedLanguage"] = {"language": lang or "en", "score": round(confidence, 2)}
+            results.append(result)
+        self._send(200, results)
+
+    def _detect(self, body) -> None:
+        if not self._check_translator_body(body):
+            return
+        results = []
+        for item in body:
+            lang, confidence = identify_language(self._text(item))
+            results.append({
+                "language": lang or "en",
+                "score": round(confidence, 2),
+                "isTranslationSupported": True,
+                "isTransliterationSupported": False,
+            })
+        self._send(200, results)
+
+
+# Speech
+
+class _Signal:
+    def __init__(self):
+        self.handlers = []
+
+    def connect(self, handler):
+        self.handlers.append(handler)
+
+    def fire(self, evt):
+        for handler in self.handlers:
+            handler(evt)
+
+
+class CannedRecognizer:
+    """
+    Canned Speech results: stands in for speechsdk.SpeechRecognizer, "hearing" canned sentences
+    Supports recognize_once and continuous recognition (events fired from
+    its own thread, like the SDK), with optional latency and failures.
+    """
+
+    def __init__(
+        self,
+        audio=None,
+        sentences: list = None,
+        segment_seconds: float = 5.0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.sentences = list(sentences or CANNED_DICTATION)
+        self.segment_seconds = segment_seconds
+        self.latency = latency
+        self.failed = random.Random(seed).random() < error_rate
+        self.recognized = _Signal()
+        self.session_stopped = _Signal()
+        self.canceled = _Signal()
+        self._stop = threading.Event()
+
+    def _result(self, index: int):
+        return SimpleNamespace(
+            reason=speechsdk.ResultReason.RecognizedSpeech,
+            text=self.sentences[index],
+            offset=int(index * self.segment_seconds * 10_000_000),
+            duration=int(self.segment_seconds * 10_000_000),
+        )
+
+    def _cancellation(self):
+        return SimpleNamespace(
+            reason=speechsdk.CancellationReason.Error,
+            error_details="Injected recognition error",
+        )
+
+    def recognize_once(self):
+        time.sleep(self.latency)
+        if self.failed:
+            return SimpleNamespace(reason=speechsdk.ResultReason.Canceled, cancellation_details=self._cancellation())
+        return self._result(0)
+
+    def _run(self):
+        for index in range(len(self.sentences)):
+            if self._stop.wait(self.latency):
+                break
+            if self.failed and index == len(self.sentences) // 2:
+                self.canceled.fire(SimpleNamespace(cancellation_details=self._cancellation()))
+                return
+            self.recognized.fire(SimpleNamespace(result=self._result(index)))
+        self.session_stopped.fire(SimpleNamespace())
+
+    def start_continuous_recognition(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop_continuous_recognition(self):
+        self._stop.set()
+
+
+def canned_recognizer_factory(error_rate: float = 0.0, seed: int = 0, **options):
+    """
+    recognizer_factory for SpeechProcessor that returns CannedRecognizers
+
+    Each recognizer draws its own failure from a seeded sequence, so a run
+    with error_rate > 0 fails the same audio inputs every time.
+
+    Example:
+        processor = SpeechProcessor(recognizer_factory=canned_recognizer_factory(latency=0.01))
+    """
+    seeds = random.Random(seed)
+    lock = threading.Lock()
+
+    def factory(audio):
+        with lock:
+            recognizer_seed = seeds.random()
+        return CannedRecognizer(audio, error_rate=error_rate, seed=recognizer_seed, **options)
+
+    return factory
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local stand-in for Azure Language and Translator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429")
+    parser.add_argument("--job-seconds", type=float, default=0.0, help="Seconds a health job stays running")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--key", default="mock-key")
+    args = parser.parse_args()
+
+    server = MockAzureServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        latency_jitter=args.jitter,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        job_seconds=args.job_seconds,
+        seed=args.seed,
+        key=args.key,
+    )
+    print(f"Mock Azure services on {server.endpoint}")
+    print("Point the app at it with:")
+    for name in ("LANGUAGE_ENDPOINT", "TRANSLATOR_ENDPOINT"):
+        print(f"  {name}={server.endpoint}")
+    for name in ("LANGUAGE_KEY", "TRANSLATOR_KEY"):
+        print(f"  {name}={args.key}")
+    # Only the v3.1 routes are served, not the SDK default /language/:analyze-text
+    print("  LANGUAGE_API_VERSION=v3.1")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
@@ -1,187 +1,302 @@
 import os
-from dotenv import load_dotenv
-from azure.ai.textanalytics import TextAnalyticsClient
-from azure.core.credentials import AzureKeyCredential
-from src.keyvault_config import KeyVaultConfig
+from src.batch_manifest import BatchManifest
+from src.credentials import default_provider
+from src.lazy_import import LazyModule
+from src.redaction import redact
+from src.result_cache import make_cache_key
+from src.text_chunker import split_text
 
 import json
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from copy import deepcopy
 from datetime import datetime
 import glob
+import threading
+
+# The Azure SDK is imported when the first PIIRedactor is created
+textanalytics = LazyModule("azure.ai.textanalytics")
+azure_credentials = LazyModule("azure.core.credentials")
+
+# Per-request document limits of the Text Analytics APIs. Batches larger than
+# this are rejected by the service, so multi-document calls are split to fit.
+MAX_DOCUMENTS_PER_REQUEST = 5
+MAX_HEALTHCARE_DOCUMENTS_PER_REQUEST = 25
+
+# Per-document character limit of the synchronous APIs. Longer documents are
+# split into chunks that overlap so entities on a cut are not lost.
+MAX_DOCUMENT_CHARS = 5120
+CHUNK_OVERLAP_CHARS = 200
+
+# Upper bound on simultaneous requests one detector sends for a document list
+MAX_CONCURRENT_REQUESTS = 8
+
+HEALTHCARE_CATEGORIES = [
+    "MedicationName",
+    "Dosage",
+    "Diagnosis",
+    "SymptomOrSign",
+    "TreatmentName",
+    "ExaminationName",
+    "BodyStructure",
+    "MedicationClass",
+    "Frequency",
+    "RouteOrMode",
+    "ConditionQualifier",
+]
+
+CONTACT_PII_CATEGORIES = [
+    "Email",
+    "PhoneNumber",
+    "USSocialSecurityNumber",
+    "IPAddress",
+    "URL",
+]
+
+# Languages all three detectors (NER, PII and Text Analytics for Health)
+# accept. Other languages are refused rather than analyzed as English,
+# which would silently miss names and identifiers.
+SUPPORTED_LANGUAGES = ("en", "es", "fr", "de", "it", "pt")
+
+DURATION_PATTERNS = [
+    "day", "days", "week", "weeks", "month", "months",
+    "year", "years", "hour", "hours", "minute", "minutes",
+]
+
+
+def _entity_to_dict(entity, default_confidence=None) -> dict:
+    if default_confidence is None:
+        confidence = entity.confidence_score
+    else:
+        confidence = getattr(entity, "confidence_score", default_confidence)
+    return {
+        "text": entity.text,
+        "category": entity.category,
+        "confidence_score": float(confidence),
+        "offset": int(entity.offset),
+        "length": int(entity.length),
+    }
+
+
+def _merge_chunk_entities(entities: list) -> list:
+    """
+    De-duplicate entities found twice in the overlap between two chunks.
+    Overlapping entities of the same category collapse into the longest one.
+    """
+    merged: list = []
+    last_by_category: dict = {}
+    for entity in sorted(entities, key=lambda e: (e["offset"], -e["length"])):
+        previous_index = last_by_category.get(entity["category"])
+        if previous_index is not None:
+            previous = merged[previous_index]
+            if entity["offset"] < previous["offset"] + previous["length"]:
+                if entity["length"] > previous["length"]:
+                    merged[previous_index] = entity
+                continue
+        last_by_category[entity["category"]] = len(merged)
+        merged.append(entity)
+    return merged
 
 
 class PIIRedactor:
-    def __init__(self) -> None:
-        load_dotenv()
-
-        endpoint = os.getenv("LANGUAGE_ENDPOINT")
-        key = os.getenv("LANGUAGE_KEY")
+    def __init__(
+        self,
+        concurrent: bool = True,
+        cache=None,
+        api_version: str = None,
+        model_version: str = None,
+        credentials=None,
+    ) -> None:
+        """
+        Args:
+            concurrent: Run the three detectors of process_document in parallel
+                threads instead of one after another.
+            cache: Optional result cache (MemoryCache, SQLiteCache or anything
+                with get/set). Hits skip every Azure call.
+            api_version: Text Analytics API version; if None, the LANGUAGE_API_VERSION
+                environment variable (e.g. "v3.1" for src.mock_azure), else the SDK default
+            model_version: Model version requested from the service (service
+                default if None)
+            credentials: CredentialProvider for LANGUAGE_ENDPOINT / LANGUAGE_KEY
+                (process-wide default_provider() if None)
+        """
+        self.concurrent = concurrent
+        self.cache = cache
+        self.model_version = model_version
+
+        credentials = credentials or default_provider()
+        endpoint, key = credentials.require("LANGUAGE_ENDPOINT", "LANGUAGE_KEY")
+        # A setting, not a secret: read from the environment, never from Key Vault
+        api_version = api_version or os.getenv("LANGUAGE_API_VERSION")
+        self.api_version = api_version
+
+        client_kwargs = {"api_version": api_version} if api_version else {}
+        self.client = textanalytics.TextAnalyticsClient(
+            endpoint=endpoint,
+            credential=azure_credentials.AzureKeyCredential(key),
+            **client_kwargs
+        )
+        self._call_kwargs = {"model_version": model_version} if model_version else {}
+
+    def _healthcare_entities(self, doc) -> list:
+        entities: list = []
+        for entity in doc.entities:
+            if entity.category in HEALTHCARE_CATEGORIES:
+                entities.append(_entity_to_dict(entity, default_confidence=1.0))
+        return entities
+
+    def _medical_entities(self, doc) -> list:
+        entities: list = []
+        for entity in doc.entities:
+            if entity.category == "Person":
+                entities.append(_entity_to_dict(entity))
+            elif entity.category == "DateTime":
+                # Only keep specific dates (with numbers), not durations or words like "Annual"
+                text_lower = entity.text.lower()
+                is_duration = any(pattern in text_lower for pattern in DURATION_PATTERNS)
+                if (
+                    entity.confidence_score > 0.95
+                    and any(char.isdigit() for char in entity.text)
+                    and not is_duration
+                ):
+                    entities.append(_entity_to_dict(entity))
+        return entities
+
+    def _contact_pii_entities(self, doc) -> list:
+        entities: list = []
+        for entity in doc.entities:
+            if entity.category in CONTACT_PII_CATEGORIES:
+                entities.append(_entity_to_dict(entity))
+        return entities
+
+    def _detect_batch(self, texts: list, analyze, extract, batch_size: int, error_label: str) -> tuple:
+        """
+        Run one Text Analytics operation over many documents.
+
+        Args:
+            texts: Documents to analyze
+            analyze: Callable taking a list of documents and returning the
+                per-document results in the same order
+            extract: Callable turning one successful document result into entities
+            batch_size: Maximum documents the service accepts per request
+            error_label: Prefix for logged and returned error messages
+
+        Returns:
+            (entities, errors) - two lists aligned with texts. A failed document
+            gets [] entities and an error string; successful ones get None.
+        """
+        # Documents over the service's character limit are split into
+        # overlapping chunks, which are analyzed like any other document
+        pieces = []
+        for doc_index, text in enumerate(texts):
+            for offset, chunk in split_text(text, MAX_DOCUMENT_CHARS, CHUNK_OVERLAP_CHARS):
+                pieces.append((doc_index, offset, chunk))
+        chunks = [chunk for _, _, chunk in pieces]
+
+        chunk_entities: list = [[] for _ in chunks]
+        chunk_errors: list = [None for _ in chunks]
+
+        def analyze_slice(start: int) -> None:
+            batch = chunks[start:start + batch_size]
+            try:
+                for index, doc in enumerate(analyze(batch), start=start):
+                    if getattr(doc, "is_error", False):
+                        chunk_errors[index] = f"{error_label}: {doc.error}"
+                        continue
+                    chunk_entities[index] = extract(doc)
+            except Exception as exc:
+                print(f"{error_label}: {exc}")
+                for index in range(start, start + len(batch)):
+                    chunk_errors[index] = f"{error_label}: {exc}"
+
+        starts = range(0, len(chunks), batch_size)
+        if self.concurrent and len(starts) > 1:
+            # Each slice writes to its own indices, so no locking is needed
+            with ThreadPoolExecutor(max_workers=min(len(starts), MAX_CONCURRENT_REQUESTS)) as executor:
+                list(executor.map(analyze_slice, starts))
+        else:
+            for start in starts:
+                analyze_slice(start)
+
+        entities: list = [[] for _ in texts]
+        errors: list = [None for _ in texts]
+        chunk_counts = [0 for _ in texts]
+        for (doc_index, offset, _), found, error in zip(pieces, chunk_entities, chunk_errors):
+            chunk_counts[doc_index] += 1
+            if error and errors[doc_index] is None:
+                errors[doc_index] = error
+            for entity in found:
+                entity["offset"] += offset
+                entities[doc_index].append(entity)
+
+        for doc_index, count in enumerate(chunk_counts):
+            if count > 1:
+                entities[doc_index] = _merge_chunk_entities(entities[doc_index])
+
+        return entities, errors
+
+    def _detect_healthcare_batch(self, texts: list, language: str = "en") -> tuple:
+        return self._detect_batch(
+            texts,
+            lambda batch: self.client.begin_analyze_healthcare_entities(
+                documents=batch, language=language, **self._call_kwargs
+            ).result(),
+            self._healthcare_entities,
+            MAX_HEALTHCARE_DOCUMENTS_PER_REQUEST,
+            "Healthcare entity detection error",
+        )
 
-        if not endpoint or not key:
-            raise ValueError("LANGUAGE_ENDPOINT and LANGUAGE_KEY must be set in the environment")
+    def _detect_medical_batch(self, texts: list, language: str = "en") -> tuple:
+        return self._detect_batch(
+            texts,
+            lambda batch: self.client.recognize_entities(documents=batch, language=language, **self._call_kwargs),
+            self._medical_entities,
+            MAX_DOCUMENTS_PER_REQUEST,
+            "Error in medical entity detection",
+        )
 
-        self.client = TextAnalyticsClient(endpoint=endpoint, credential=AzureKeyCredential(key))
+    def _detect_contact_pii_batch(self, texts: list, language: str = "en") -> tuple:
+        return self._detect_batch(
+            texts,
+            lambda batch: self.client.recognize_pii_entities(documents=batch, language=language, **self._call_kwargs),
+            self._contact_pii_entities,
+            MAX_DOCUMENTS_PER_REQUEST,
+            "Error in PII detection",
+        )
 
     def detect_healthcare_entities(self, text: str) -> list:
         """
         Detect healthcare-specific entities using Text Analytics for Health.
         Categories: MedicationName, Dosage, Diagnosis, BodyStructure, etc.
         """
-        try:
-            poller = self.client.begin_analyze_healthcare_entities(documents=[text])
-            result = poller.result()
-
-            entities: list = []
-            for doc in result:
-                if getattr(doc, "is_error", False):
-                    continue
-                for entity in doc.entities:
-                    if entity.category in [
-                        "MedicationName",
-                        "Dosage",
-                        "Diagnosis",
-                        "SymptomOrSign",
-                        "TreatmentName",
-                        "ExaminationName",
-                        "BodyStructure",
-                        "MedicationClass",
-                        "Frequency",
-                        "RouteOrMode",
-                        "ConditionQualifier",
-                    ]:
-                        entities.append({
-                            "text": entity.text,
-                            "category": entity.category,
-                            "confidence_score": float(getattr(entity, "confidence_score", 1.0)),
-                            "offset": int(entity.offset),
-                            "length": int(entity.length),
-                        })
-            return entities
-        except Exception as e:
-            print(f"Healthcare entity detection error: {e}")
-            return []
+        return self._detect_healthcare_batch([text])[0][0]
 
     def detect_medical_entities(self, text: str) -> list:
         """
         Detect person names and dates using general NER (for PII redaction).
         """
-        try:
-            response = self.client.recognize_entities(documents=[text], language="en")
-            entities: list = []
-            for doc in response:
-                if getattr(doc, "is_error", False):
-                    continue
-                for entity in doc.entities:
-                    if entity.category == "Person":
-                        entities.append({
-                            "text": entity.text,
-                            "category": entity.category,
-                            "confidence_score": float(entity.confidence_score),
-                            "offset": int(entity.offset),
-                            "length": int(entity.length),
-                        })
-                    elif entity.category == "DateTime":
-                        # Only keep specific dates (with numbers), not durations or words like "Annual"
-                        text_lower = entity.text.lower()
-                        duration_patterns = [
-                            "day", "days", "week", "weeks", "month", "months",
-                            "year", "years", "hour", "hours", "minute", "minutes",
-                        ]
-                        is_duration = any(pattern in text_lower for pattern in duration_patterns)
-                        if (
-                            entity.confidence_score > 0.95
-                            and any(char.isdigit() for char in entity.text)
-                            and not is_duration
-                        ):
-                            entities.append({
-                                "text": entity.text,
-                                "category": entity.category,
-                                "confidence_score": float(entity.confidence_score),
-                                "offset": int(entity.offset),
-                                "length": int(entity.length),
-                            })
-            return entities
-        except Exception as exc:
-            print(f"Error in medical entity detection: {exc}")
-            return []
+        return self._detect_medical_batch([text])[0][0]
 
     def detect_contact_pii(self, text: str) -> list:
         """
         Detect contact PII ONLY (email, phone, SSN, IP, URL).
         """
-        try:
-            response = self.client.recognize_pii_entities(documents=[text], language="en")
-            entities: list = []
-
-            for doc in response:
-                if getattr(doc, "is_error", False):
-                    continue
-
-                for entity in doc.entities:
-                    if entity.category in [
-                        "Email",
-                        "PhoneNumber",
-                        "USSocialSecurityNumber",
-                        "IPAddress",
-                        "URL",
-                    ]:
-                        entities.append(
-                            {
-                                "text": entity.text,
-                                "category": entity.category,
-                                "confidence_score": float(entity.confidence_score),
-                                "offset": int(entity.offset),
-                                "length": int(entity.length),
-                            }
-                        )
-
-            return entities
-        except Exception as exc:
-            print(f"Error in PII detection: {exc}")
-            return []
+        return self._detect_contact_pii_batch([text])[0][0]
 
     def redact_text(self, text: str, medical_entities: list, pii_entities: list) -> str:
         """
         Redact text based on BOTH medical and PII entities.
         """
-        redacted = text
-        all_entities = medical_entities + pii_entities
-
-        all_entities.sort(key=lambda x: x["offset"], reverse=True)
-
-        for entity in all_entities:
-            start = entity["offset"]
-            end = start + entity["length"]
-
-            category = entity["category"]
-            if category == "Person":
-                tag = "[PERSON]"
-            elif category == "Location":
-                tag = "[LOCATION]"
-            elif category == "Organization":
-                tag = "[ORGANIZATION]"
-            elif category == "DateTime":
-                tag = "[DATE]"
-            elif category == "Email":
-                tag = "[EMAIL]"
-            elif category == "PhoneNumber":
-                tag = "[PHONE]"
-            elif category == "USSocialSecurityNumber":
-                tag = "[SSN]"
-            elif category == "IPAddress":
-                tag = "[IP]"
-            elif category == "URL":
-                tag = "[URL]"
-            else:
-                continue
-
-            redacted = redacted[:start] + tag + redacted[end:]
+        return self.redact_text_with_map(text, medical_entities, pii_entities)[0]
 
-        return redacted
+    def redact_text_with_map(self, text: str, medical_entities: list, pii_entities: list) -> tuple:
+        """
+        Redact text and also return the span map (original -> redacted offsets).
+        Overlapping or nested entities are merged into a single placeholder.
+        """
+        return redact(text, medical_entities + pii_entities)
 
-    def process_document(self, text: str) -> dict:
-        healthcare_entities = self.detect_healthcare_entities(text)
-        medical_entities = self.detect_medical_entities(text)
-        pii_entities = self.detect_contact_pii(text)
+    def _build_result(self, text: str, healthcare_entities: list, medical_entities: list, pii_entities: list) -> dict:
         redacted_text = self.redact_text(text, medical_entities, pii_entities)
 
         return {
@@ -194,135 +309,482 @@ class PIIRedactor:
             "redacted_text": redacted_text,
         }
 
+    def _cache_key(self, text: str, language: str = "en") -> str:
+        # Anything that changes the output for the same text belongs in the key
+        return make_cache_key(
+            "pii_redactor",
+            text,
+            language,
+            HEALTHCARE_CATEGORIES,
+            CONTACT_PII_CATEGORIES,
+            DURATION_PATTERNS,
+            self.api_version,
+            self.model_version,
+        )
+
+    @staticmethod
+    def _to_cache_value(result: dict) -> dict:
+        # Only entity positions and categories are cached, never the note or the
+        # entity text, so a persistent cache holds no PHI in plaintext
+        return {
+            name: [{k: v for k, v in entity.items() if k != "text"} for entity in result[name]]
+            for name in ("healthcare_entities", "medical_entities", "pii_entities")
+        }
+
+    def _from_cache_value(self, text: str, value: dict) -> dict:
+        entities = {
+            name: [dict(entity, text=text[entity["offset"]:entity["offset"] + entity["length"]]) for entity in spans]
+            for name, spans in value.items()
+            if name in ("healthcare_entities", "medical_entities", "pii_entities")
+        }
+        return self._build_result(text, entities["healthcare_entities"], entities["medical_entities"], entities["pii_entities"])
+
+    def _analyze(self, texts: list, language: str = "en") -> list:
+        if self.concurrent:
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                healthcare_future = executor.submit(self._detect_healthcare_batch, texts, language)
+                medical_future = executor.submit(self._detect_medical_batch, texts, language)
+                pii_future = executor.submit(self._detect_contact_pii_batch, texts, language)
+                healthcare, healthcare_errors = healthcare_future.result()
+                medical, medical_errors = medical_future.result()
+                pii, pii_errors = pii_future.result()
+        else:
+            healthcare, healthcare_errors = self._detect_healthcare_batch(texts, language)
+            medical, medical_errors = self._detect_medical_batch(texts, language)
+            pii, pii_errors = self._detect_contact_pii_batch(texts, language)
+
+        results = []
+        for index, text in enumerate(texts):
+            result = self._build_result(text, healthcare[index], medical[index], pii[index])
+            result["errors"] = [
+                error
+                for error in (healthcare_errors[index], medical_errors[index], pii_errors[index])
+                if error
+            ]
+            results.append(result)
+        return results
+
+    def process_document(self, text: str, language: str = "en") -> dict:
+        # The detectors are independent round trips, so with concurrent=True they
+        # are fired at once and latency is that of the slowest one (usually the
+        # healthcare poller). A failing detector contributes [] as before.
+        result = self.process_documents([text], language)[0]
+        del result["errors"]
+        return result
+
+    def process_documents(self, texts: list, language: str = "en") -> list:
+        """
+        Process many documents with as few service requests as possible.
+
+        Documents are packed into service-sized batches for each of the three
+        detectors, so N documents cost about N/5 + N/5 + N/25 requests
+        instead of 3*N. With a cache configured, only documents not seen
+        before are sent to Azure.
+
+        Args:
+            texts: Documents to analyze
+            language: Language of the documents, one of SUPPORTED_LANGUAGES
+
+        Returns:
+            One process_document-style dict per input, in the same order, with
+            an extra "errors" list holding any per-document service errors
+
+        Raises:
+            ValueError: If language is not in SUPPORTED_LANGUAGES
+        """
+        if language not in SUPPORTED_LANGUAGES:
+            raise ValueError(f"PHI detection does not support language '{language}'; use one of {SUPPORTED_LANGUAGES}")
+
+        texts = list(texts)
+        if not texts:
+            return []
+
+        if self.cache is None:
+            return self._analyze(texts, language)
+
+        results: list = [None for _ in texts]
+        keys = [self._cache_key(text, language) for text in texts]
+        pending = {}
+        for index, key in enumerate(keys):
+            if key in pending:
+                pending[key].append(index)
+                continue
+            cached = self.cache.get(key)
+            if cached is None:
+                pending[key] = [index]
+                continue
+            result = self._from_cache_value(texts[index], cached)
+            result["errors"] = []
+            results[index] = result
+
+        if pending:
+            misses = [indexes[0] for indexes in pending.values()]
+            for index, result in zip(misses, self._analyze([texts[i] for i in misses], language)):
+                if not result["errors"]:
+                    # Failed calls are not cached, so they are retried next time
+                    self.cache.set(keys[index], self._to_cache_value(result))
+                for same_text_index in pending[keys[index]]:
+                    results[same_text_index] = result if same_text_index == index else deepcopy(result)
+
+        return results
+
+    def cache_stats(self):
+        """Hit/miss counters of the result cache, or None if caching is off"""
+        return self.cache.stats() if self.cache is not None else None
+
     def save_results(self, results: dict, filepath: str) -> None:
         os.makedirs("data", exist_ok=True)
         with open(filepath, "w", encoding="utf-8") as f:
             json.dump(results, f, indent=2)
 
-    def process_batch(self, input_dir: str, output_dir: str) -> dict:
+    def _read_document(self, filepath: str) -> str:
         """
-        Process multiple files (TXT, PDF, DOCX)
+        Read a TXT, PDF or DOCX file as plain text.
+        Raises ValueError for unsupported types or missing optional readers.
         """
-        import glob
-        
-        # Support multiple file types
-        file_patterns = [
-            os.path.join(input_dir, "*.txt"),
-            os.path.join(input_dir, "*.pdf"),
-            os.path.join(input_dir, "*.docx")
-        ]
-        
-        files = []
-        for pattern in file_patterns:
-            files.extend(glob.glob(pattern))
-        
-        results = {
-            "timestamp": datetime.now().isoformat(),
-            "total_files": len(files),
-            "total_entities": 0,
-            "files_processed": [],
-            "category_breakdown": {},
-            "errors": []
-        }
-        
-        os.makedirs(output_dir, exist_ok=True)
-        
-        for filepath in files:
+        file_ext = os.path.splitext(filepath)[1].lower()
+
+        if file_ext == '.txt':
+            with open(filepath, 'r', encoding='utf-8') as f:
+                return f.read()
+
+        if file_ext == '.pdf':
+            try:
+                import PyPDF2
+            except ImportError:
+                print("  ⚠️ PyPDF2 not installed. Run: pip install PyPDF2")
+                raise ValueError("PyPDF2 not installed")
+            with open(filepath, 'rb') as f:
+                reader = PyPDF2.PdfReader(f)
+                text = ""
+                for page in reader.pages:
+                    text += page.extract_text()
+            return text
+
+        if file_ext == '.docx':
+            try:
+                import docx
+            except ImportError:
+                print("  ⚠️ python-docx not installed. Run: pip install python-docx")
+                raise ValueError("python-docx not installed")
+            doc = docx.Document(filepath)
+            return "\n".join([para.text for para in doc.paragraphs])
+
+        print(f"  ⚠️ Unsupported file type: {file_ext}")
+        raise ValueError("Unsupported file type")
+
+    def _process_file_batch(self, filepaths: list, output_dir: str, gate) -> list:
+        """
+        Read, analyze and write one batch of files.
+
+        Only the service calls run under gate, so reading and writing of other
+        batches overlap with requests that are in flight.
+
+        Returns:
+            One record per file, in input order: {"filename", "path", "file_result",
+            "errors", "skipped"} where file_result is None if the file could not be processed
+        """
+        records = []
+        loaded = []
+        for filepath in filepaths:
             filename = os.path.basename(filepath)
+            record = {"filename": filename, "path": filepath, "file_result": None, "errors": [], "skipped": False}
+            records.append(record)
+            print(f"\n📄 Reading: {filename}")
+            try:
+                loaded.append((record, filepath, self._read_document(filepath)))
+            except ValueError as e:
+                record["errors"].append(f"{filename}: {str(e)}")
+            except Exception as e:
+                print(f"  ❌ Error processing {filename}: {e}")
+                record["errors"].append(f"{filename}: {str(e)}")
+
+        if not loaded:
+            return records
+
+        texts = [text for _, _, text in loaded]
+        with gate:
+            doc_results = self.process_documents(texts)
+
+        for (record, filepath, _), doc_result in zip(loaded, doc_results):
+            filename = record["filename"]
             file_ext = os.path.splitext(filename)[1].lower()
-            
-            print(f"\n📄 Processing: {filename}")
-            
+
             try:
-                # Read file based on type
-                if file_ext == '.txt':
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        text = f.read()
-                
-                elif file_ext == '.pdf':
-                    try:
-                        import PyPDF2
-                        with open(filepath, 'rb') as f:
-                            reader = PyPDF2.PdfReader(f)
-                            text = ""
-                            for page in reader.pages:
-                                text += page.extract_text()
-                    except ImportError:
-                        print("  ⚠️ PyPDF2 not installed. Run: pip install PyPDF2")
-                        results["errors"].append(f"{filename}: PyPDF2 not installed")
-                        continue
-                
-                elif file_ext == '.docx':
-                    try:
-                        import docx
-                        doc = docx.Document(filepath)
-                        text = "\n".join([para.text for para in doc.paragraphs])
-                    except ImportError:
-                        print("  ⚠️ python-docx not installed. Run: pip install python-docx")
-                        results["errors"].append(f"{filename}: python-docx not installed")
-                        continue
-                
-                else:
-                    print(f"  ⚠️ Unsupported file type: {file_ext}")
-                    results["errors"].append(f"{filename}: Unsupported file type")
-                    continue
-                
-                # Process document
-                doc_result = self.process_document(text)
-                
                 # Save redacted file
                 base_name = os.path.splitext(filename)[0]
                 output_path = os.path.join(output_dir, f"{base_name}_REDACTED.txt")
                 with open(output_path, 'w', encoding='utf-8') as f:
                     f.write(doc_result["redacted_text"])
-                
-                # Update statistics
-                entity_count = doc_result["total_entities"]
-                results["total_entities"] += entity_count
-                
+
                 all_entities = (
-                    doc_result.get("healthcare_entities", []) + 
-                    doc_result.get("medical_entities", []) + 
+                    doc_result.get("healthcare_entities", []) +
+                    doc_result.get("medical_entities", []) +
                     doc_result.get("pii_entities", [])
                 )
-                
-                file_result = {
+
+                record["file_result"] = {
                     "filename": filename,
                     "file_type": file_ext,
-                    "entity_count": entity_count,
+                    "entity_count": doc_result["total_entities"],
                     "categories": [e["category"] for e in all_entities]
                 }
-                results["files_processed"].append(file_result)
-                
-                # Count categories
-                for entity in all_entities:
-                    cat = entity["category"]
-                    results["category_breakdown"][cat] = results["category_breakdown"].get(cat, 0) + 1
-                
-                print(f"  ✅ Found {entity_count} entities")
-            
+                for error in doc_result["errors"]:
+                    record["errors"].append(f"{filename}: {error}")
+
+                print(f"  ✅ {filename}: found {doc_result['total_entities']} entities")
+
             except Exception as e:
                 print(f"  ❌ Error processing {filename}: {e}")
-                results["errors"].append(f"{filename}: {str(e)}")
-        
+                record["errors"].append(f"{filename}: {str(e)}")
+
+        return records
+
+    def _iter_input_files(self, input_dir: str):
+        # Support multiple file types; iglob keeps huge folders out of memory
+        for pattern in ("*.txt", "*.pdf", "*.docx"):
+            yield from glob.iglob(os.path.join(input_dir, pattern))
+
+    def iter_batch(
+        self,
+        input_dir: str,
+        output_dir: str,
+        batch_size: int = MAX_HEALTHCARE_DOCUMENTS_PER_REQUEST,
+        max_workers: int = 1,
+        max_in_flight: int = None,
+        force: bool = False,
+    ):
+        """
+        Process multiple files (TXT, PDF, DOCX) and yield per-file results as they complete
+
+        Memory stays flat regardless of folder size: files are listed lazily and
+        only a bounded window of batches is in flight at any time.
+
+        Progress is checkpointed in a manifest in output_dir, so a rerun skips
+        files that already succeeded and are unchanged, and retries failures.
+
+        Args:
+            input_dir: Folder with the documents to redact
+            output_dir: Folder for the *_REDACTED.txt outputs
+            batch_size: Documents sent to process_documents at a time
+            max_workers: Worker threads that read, analyze and write batches
+            max_in_flight: Upper bound on documents being analyzed by the
+                Language resource at once (keeps the job under its TPS quota).
+                Defaults to max_workers * batch_size.
+            force: Reprocess every file even if the manifest marks it done
+
+        Yields:
+            {"filename", "path", "file_result", "errors", "skipped"} per file, in
+            file order. file_result is None if the file could not be processed;
+            skipped files replay the file_result recorded in the manifest.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        manifest = BatchManifest(output_dir)
+
+        max_workers = max(1, max_workers)
+        if max_in_flight:
+            batch_size = min(batch_size, max_in_flight)
+            gate = threading.BoundedSemaphore(max(1, max_in_flight // batch_size))
+        else:
+            gate = threading.BoundedSemaphore(max_workers)
+
+        def process_and_checkpoint(batch: list) -> list:
+            records = self._process_file_batch(batch, output_dir, gate)
+            for record in records:
+                status = "done" if record["file_result"] is not None and not record["errors"] else "failed"
+                try:
+                    manifest.record(record["path"], status, record["file_result"], record["errors"])
+                except OSError as e:
+                    record["errors"].append(f"{record['filename']}: {e}")
+            return records
+
+        def resolved(filepath: str, file_result: dict, errors: list, skipped: bool) -> Future:
+            future = Future()
+            future.set_result([{
+                "filename": os.path.basename(filepath),
+                "path": filepath,
+                "file_result": file_result,
+                "errors": errors,
+                "skipped": skipped,
+            }])
+            return future
+
+        files = self._iter_input_files(input_dir)
+        # One (future, index) slot per file, in file order. Files waiting for a
+        # batch get their slot as they are listed, so a replayed or failed
+        # record never overtakes an earlier file that is still to be analyzed.
+        pending = deque()
+        # Every worker busy plus one batch queued; replayed records count too,
+        # so a rerun over a mostly finished folder does not buffer its skip list
+        max_pending = (max_workers + 1) * batch_size
+        batch = []
+        batch_future = None
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+                def submit():
+                    nonlocal batch
+                    if not batch:
+                        return
+                    target = batch_future
+
+                    def deliver(future):
+                        if future.exception() is not None:
+                            target.set_exception(future.exception())
+                        else:
+                            target.set_result(future.result())
+
+                    executor.submit(process_and_checkpoint, batch).add_done_callback(deliver)
+                    batch = []
+
+                def drain(limit: int):
+                    # Yield whatever is finished at the head; block only beyond limit
+                    while pending and (pending[0][0].done() or len(pending) > limit):
+                        future, index = pending[0]
+                        if future is batch_future and batch:
+                            # The head waits on the open batch: send it as it is
+                            submit()
+                        pending.popleft()
+                        yield future.result()[index]
+
+                for filepath in files:
+                    try:
+                        done = not force and manifest.is_done(filepath)
+                    except OSError as e:
+                        # Deleted or unreadable since it was listed
+                        print(f"  ❌ Error processing {os.path.basename(filepath)}: {e}")
+                        pending.append((resolved(filepath, None, [f"{os.path.basename(filepath)}: {e}"], False), 0))
+                    else:
+                        if done:
+                            # Replay the checkpointed result without calling Azure
+                            entry = manifest.get(filepath)
+                            pending.append((resolved(filepath, entry["file_result"], [], True), 0))
+                        else:
+                            if not batch:
+                                batch_future = Future()
+                            pending.append((batch_future, len(batch)))
+                            batch.append(filepath)
+                            if len(batch) == batch_size:
+                                submit()
+                    yield from drain(max_pending)
+
+                submit()
+                yield from drain(0)
+        finally:
+            manifest.close()
+
+    def _merge_record(self, summary: dict, record: dict) -> None:
+        summary["total_files"] += 1
+        file_result = record["file_result"]
+        if file_result is not None:
+            summary["total_entities"] += file_result["entity_count"]
+
+            # Count categories
+            for cat in file_result["categories"]:
+                summary["category_breakdown"][cat] = summary["category_breakdown"].get(cat, 0) + 1
+
+    def process_batch(
+        self,
+        input_dir: str,
+        output_dir: str,
+        batch_size: int = MAX_HEALTHCARE_DOCUMENTS_PER_REQUEST,
+        max_workers: int = 1,
+        max_in_flight: int = None,
+        force: bool = False,
+    ) -> dict:
+        """
+        Process multiple files (TXT, PDF, DOCX)
+
+        Collects everything iter_batch yields into one summary dict; use
+        iter_batch directly for very large folders.
+        """
+        results = {
+            "timestamp": datetime.now().isoformat(),
+            "total_files": 0,
+            "total_entities": 0,
+            "files_processed": [],
+            "category_breakdown": {},
+            "errors": []
+        }
+
+        for record in self.iter_batch(input_dir, output_dir, batch_size, max_workers, max_in_flight, force):
+            self._merge_record(results, record)
+            if record["file_result"] is not None:
+                results["files_processed"].append(record["file_result"])
+            results["errors"].extend(record["errors"])
+
         return results
 
+    def save_results_jsonl(self, records, filepath: str) -> dict:
+        """
+        Write batch records as JSON Lines while they are produced
 
-if __name__ == "__main__":
-    import sys
+        Each record from iter_batch becomes one line, flushed immediately so
+        downstream consumers can tail the file before the batch finishes. A
+        final {"summary": ...} line holds the aggregate counts.
+
+        Returns:
+            The aggregate summary
+        """
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        summary = {
+            "timestamp": datetime.now().isoformat(),
+            "total_files": 0,
+            "total_entities": 0,
+            "category_breakdown": {},
+            "error_count": 0,
+        }
+
+        with open(filepath, "w", encoding="utf-8") as f:
+            for record in records:
+                self._merge_record(summary, record)
+                summary["error_count"] += len(record["errors"])
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+            f.write(json.dumps({"summary": summary}) + "\n")
 
-    redactor = PIIRedactor()
+        return summary
 
-    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Detect and redact PHI in medical text")
+    parser.add_argument("--batch", action="store_true", help="Redact every file in data/sample_texts")
+    parser.add_argument("--workers", type=int, default=1, help="Batch worker threads")
+    parser.add_argument("--max-in-flight", type=int, default=None,
+                        help="Max documents analyzed by the Language resource at once")
+    parser.add_argument("--cache", default=None,
+                        help="SQLite file for cached entity spans, no note text (e.g. data/cache/results.sqlite)")
+    parser.add_argument("--force", action="store_true",
+                        help="Reprocess files the batch manifest already marks as done")
+    args = parser.parse_args()
+
+    cache = None
+    if args.cache:
+        from src.result_cache import SQLiteCache
+        cache = SQLiteCache(args.cache)
+
+    redactor = PIIRedactor(cache=cache)
+
+    if args.batch:
         # Batch mode
         print("=" * 70)
         print("BATCH PROCESSING MODE")
         print("=" * 70)
 
-        results = redactor.process_batch(
+        records = redactor.iter_batch(
             input_dir="data/sample_texts",
-            output_dir="data/redacted_texts"
+            output_dir="data/redacted_texts",
+            max_workers=args.workers,
+            max_in_flight=args.max_in_flight,
+            force=args.force,
         )
+        results = redactor.save_results_jsonl(records, "data/batch_summary.jsonl")
 
         print("\n" + "=" * 70)
         print("BATCH PROCESSING SUMMARY")
@@ -333,8 +795,11 @@ if __name__ == "__main__":
         for category, count in sorted(results['category_breakdown'].items()):
             print(f"  - {category}: {count}")
 
-        redactor.save_results(results, "data/batch_summary.json")
-        print(f"\n✅ Summary saved to data/batch_summary.json")
+        if cache is not None:
+            stats = redactor.cache_stats()
+            print(f"\nCache: {stats['hits']} hits, {stats['misses']} misses")
+
+        print(f"\n✅ Summary saved to data/batch_summary.jsonl")
         print(f"✅ Redacted files saved to data/redacted_texts/")
 
     else:
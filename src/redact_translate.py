@@ -0,0 +1,148 @@
+import html
+import re
+
+from src.pii_redactor import PIIRedactor
+from src.translation_memory import TranslationMemory
+from src.translator import MedicalTranslator
+
+# Translator leaves elements with this class untouched in textType=html
+NOTRANSLATE_OPEN = '<span class="notranslate">'
+NOTRANSLATE_CLOSE = '</span>'
+
+# The service may re-quote or re-space the attribute, so match loosely on the way back
+_NOTRANSLATE_SPAN = re.compile(r"<span\s+class\s*=\s*[\"']notranslate[\"']\s*>(.*?)</span>", re.S | re.I)
+
+
+def protect_placeholders(redacted_text: str, span_map: list) -> str:
+    """
+    Turn redacted text into Translator HTML with placeholders marked notranslate
+
+    Placeholder positions come from the redaction span map, so text that
+    merely looks like a placeholder is escaped and translated as usual.
+    """
+    parts = []
+    position = 0
+    for span in sorted(span_map, key=lambda s: s["redacted_offset"]):
+        start = span["redacted_offset"]
+        end = start + span["redacted_length"]
+        parts.append(html.escape(redacted_text[position:start], quote=False))
+        parts.append(NOTRANSLATE_OPEN + html.escape(redacted_text[start:end], quote=False) + NOTRANSLATE_CLOSE)
+        position = end
+    parts.append(html.escape(redacted_text[position:], quote=False))
+    return "".join(parts)
+
+
+def restore_placeholders(translated_html: str) -> str:
+    """Strip the notranslate markup again and unescape back to plain text"""
+    return html.unescape(_NOTRANSLATE_SPAN.sub(r"\1", translated_html))
+
+
+class RedactTranslatePipeline:
+    """
+    Redact PHI first, then translate only the redacted text
+    Names and identifiers never reach the Translator, and because placeholders
+    replace them, the same sentence from different patients hits the same
+    translation memory entry.
+    """
+
+    def __init__(self, redactor: PIIRedactor = None, translator: MedicalTranslator = None, memory_path: str = None):
+        """
+        Args:
+            redactor: PIIRedactor to use (a new one by default)
+            translator: MedicalTranslator to use; by default one with a
+                TranslationMemory, so redacted sentences are translated once
+            memory_path: Optional SQLite file that keeps the default translator's
+                memory across restarts. Only redacted text reaches it.
+        """
+        self.redactor = redactor or PIIRedactor()
+        self.translator = translator or MedicalTranslator(
+            memory=TranslationMemory(memory_path, redacted_input=True)
+        )
+
+    def process_documents(self, texts: list, from_lang: str = "en", to_langs: list = None) -> list:
+        """
+        Redact and translate many documents
+
+        Args:
+            texts: Original documents
+            from_lang: Source language code; PHI is detected in this language,
+                so it must be one of pii_redactor.SUPPORTED_LANGUAGES
+            to_langs: Target language codes (default ['tr'])
+
+        Returns:
+            One PIIRedactor.process_documents result per text, plus:
+            {
+                "translations": {"tr": "redacted translation", ...},
+                "translation_error": "error message if failed" or None
+            }
+            Documents with a detector error are not translated, since their
+            redaction may be incomplete.
+
+        Raises:
+            ValueError: If PHI detection does not support from_lang; nothing
+                is sent to the Translator then
+
+        Example:
+            pipeline = RedactTranslatePipeline()
+            results = pipeline.process_documents(notes, "en", ["tr", "de"])
+        """
+        to_langs = list(to_langs or ["tr"])
+        results = self.redactor.process_documents(texts, language=from_lang)
+
+        # Rebuild the span maps from the detected entities; no extra service calls
+        pending = []
+        for index, result in enumerate(results):
+            result["translations"] = {lang: "" for lang in to_langs}
+            result["translation_error"] = None
+            if result.get("errors"):
+                result["translation_error"] = "Redaction failed; text was not translated"
+                continue
+            redacted, span_map = self.redactor.redact_text_with_map(
+                result["original_text"], result["medical_entities"], result["pii_entities"]
+            )
+            pending.append((index, protect_placeholders(redacted, span_map)))
+
+        if pending:
+            translated = self.translator.translate_many(
+                [markup for _, markup in pending], from_lang=from_lang, to_langs=to_langs, text_type="html"
+            )
+            for (index, _), translation in zip(pending, translated):
+                results[index]["translation_error"] = translation["error"]
+                results[index]["translations"] = {
+                    lang: restore_placeholders(text) for lang, text in translation["translations"].items()
+                }
+
+        return results
+
+    def process_document(self, text: str, from_lang: str = "en", to_lang: str = "tr") -> dict:
+        """
+        Redact and translate one document
+
+        Returns:
+            PIIRedactor.process_document result plus "translated_text" and
+            "translation_error". If any detector failed, the text is not
+            translated at all rather than sent with PHI possibly left in.
+
+        Raises:
+            ValueError: If PHI detection does not support from_lang
+        """
+        result = self.process_documents([text], from_lang, [to_lang])[0]
+        del result["errors"]
+        result["translated_text"] = result.pop("translations")[to_lang]
+        return result
+
+
+# Test
+if __name__ == "__main__":
+    pipeline = RedactTranslatePipeline()
+
+    notes = [
+        "Patient Mary Johnson, DOB: 07/22/1978. Chief Complaint: Chest pain.",
+        "Patient Robert Lee, DOB: 11/05/1990. Chief Complaint: Chest pain.",
+    ]
+
+    for result in pipeline.process_documents(notes, "en", ["tr"]):
+        print(f"\n📝 Redacted (EN): {result['redacted_text']}")
+        print(f"🇹🇷 Turkish: {result['translations']['tr']}")
+
+    print(f"\nTranslation memory: {pipeline.translator.memory_stats()}")
@@ -0,0 +1,117 @@
+from bisect import bisect_right
+
+
+# Placeholder written in place of each redacted entity category
+REDACTION_TAGS = {
+    "Person": "[PERSON]",
+    "Location": "[LOCATION]",
+    "Organization": "[ORGANIZATION]",
+    "DateTime": "[DATE]",
+    "Email": "[EMAIL]",
+    "PhoneNumber": "[PHONE]",
+    "USSocialSecurityNumber": "[SSN]",
+    "IPAddress": "[IP]",
+    "URL": "[URL]",
+}
+
+
+def merge_spans(entities: list, tags: dict = REDACTION_TAGS) -> list:
+    """
+    Turn entities into sorted, non-overlapping (start, end, tag) spans
+
+    Entities whose category has no tag are ignored. Overlapping or nested
+    spans are merged into one span that keeps the tag of the entity starting
+    first (the outer one for nested spans).
+    """
+    # Longest first among spans with the same start, so it is the one kept
+    spans = sorted(
+        (
+            (entity["offset"], entity["offset"] + entity["length"], tags[entity["category"]])
+            for entity in entities
+            if entity["category"] in tags
+        ),
+        key=lambda span: (span[0], -span[1]),
+    )
+
+    merged: list = []
+    for start, end, tag in spans:
+        if merged and start < merged[-1][1]:
+            previous_start, previous_end, previous_tag = merged[-1]
+            merged[-1] = (previous_start, max(previous_end, end), previous_tag)
+        else:
+            merged.append((start, end, tag))
+    return merged
+
+
+def redact(text: str, entities: list, tags: dict = REDACTION_TAGS) -> tuple:
+    """
+    Replace entity spans with their tags in a single pass
+
+    Args:
+        text: Original text
+        entities: Entity dicts with offset, length and category
+        tags: Category -> placeholder table
+
+    Returns:
+        (redacted_text, span_map) where span_map lists, in order, one dict per
+        replaced span: original_offset, original_length, redacted_offset,
+        redacted_length and tag
+
+    Example:
+        redacted, span_map = redact(text, medical_entities + pii_entities)
+    """
+    parts = []
+    span_map = []
+    position = 0
+    redacted_length = 0
+
+    for start, end, tag in merge_spans(entities, tags):
+        parts.append(text[position:start])
+        redacted_length += start - position
+        span_map.append({
+            "original_offset": start,
+            "original_length": end - start,
+            "redacted_offset": redacted_length,
+            "redacted_length": len(tag),
+            "tag": tag,
+        })
+        parts.append(tag)
+        redacted_length += len(tag)
+        position = end
+
+    parts.append(text[position:])
+    return "".join(parts), span_map
+
+
+def offset_mapper(span_map: list):
+    """
+    Function translating offsets in the original text into the redacted text
+    The lookup table is built once, so map many offsets through one mapper.
+    Offsets inside a redacted span map to the start of its tag.
+
+    Example:
+        to_redacted = offset_mapper(span_map)
+        offsets = [to_redacted(entity["offset"]) for entity in healthcare_entities]
+    """
+    starts = [span["original_offset"] for span in span_map]
+
+    def to_redacted(original_offset: int) -> int:
+        index = bisect_right(starts, original_offset) - 1
+        if index < 0:
+            return original_offset
+
+        span = span_map[index]
+        original_end = span["original_offset"] + span["original_length"]
+        if original_offset < original_end:
+            return span["redacted_offset"]
+        return span["redacted_offset"] + span["redacted_length"] + (original_offset - original_end)
+
+    return to_redacted
+
+
+def map_offset(span_map: list, original_offset: int) -> int:
+    """
+    Translate one offset in the original text into the redacted text.
+    Use offset_mapper to map several offsets against the same span map.
+    """
+    return offset_mapper(span_map)(original_offset)
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from copy import deepcopy
+
+
+def make_cache_key(*parts) -> str:
+    """
+    Build a content-addressed cache key from JSON-serialisable parts.
+
+    Example:
+        key = make_cache_key("pii", text, ["Email"], "v3.1")
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+EVICTION_POLICIES = ("lru", "fifo")
+
+
+class MemoryCache:
+    """
+    In-process LRU (or FIFO) cache with optional TTL
+    Values are copied on the way in and out, so callers can mutate them freely
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = None, policy: str = "lru"):
+        """
+        Args:
+            max_entries: Entries are evicted beyond this size
+            ttl_seconds: Entries older than this are treated as misses (None = never expire)
+            policy: "lru" evicts the least recently used entry, "fifo" the oldest one
+        """
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"policy must be one of {EVICTION_POLICIES}")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """Return the cached value for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created, value = entry
+                if self.ttl_seconds is None or time.time() - created < self.ttl_seconds:
+                    if self.policy == "lru":
+                        self._entries.move_to_end(key)
+                    self.hits += 1
+                    return deepcopy(value)
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class SQLiteCache:
+    """
+    On-disk cache backed by a single SQLite file
+    Survives restarts, so batch reruns and UI sessions share results.
+    Values are stored as plaintext JSON: never cache PHI here (PIIRedactor
+    stores only entity offsets and categories) and keep the file on
+    encrypted storage with the same access controls as the source notes.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/cache/results.sqlite",
+        max_entries: int = 100000,
+        ttl_seconds: float = None,
+        policy: str = "lru",
+    ):
+        """
+        Args:
+            path: SQLite database file (created if missing)
+            max_entries: Entries are evicted beyond this size
+            ttl_seconds: Entries older than this are treated as misses (None = never expire)
+            policy: "lru" evicts the least recently used entries, "fifo" the oldest ones
+        """
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"policy must be one of {EVICTION_POLICIES}")
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)")
+        self._conn.commit()
+
+    def get(self, key: str):
+        """Return the cached value for key, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                value, created = row
+                if self.ttl_seconds is None or now - created < self.ttl_seconds:
+                    self._conn.execute("UPDATE cache SET accessed = ? WHERE key = ?", (now, key))
+                    self._conn.commit()
+                    self.hits += 1
+                    return json.loads(value)
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            if count > self.max_entries:
+                order = "accessed" if self.policy == "lru" else "created"
+                self._conn.execute(
+                    f"DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY {order} LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
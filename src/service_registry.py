@@ -0,0 +1,129 @@
+import threading
+
+
+class ServiceRegistry:
+    """
+    Process-wide, thread-safe registry of shared service clients
+    Each service is built by its factory on first use and then shared by
+    every caller (e.g. all Streamlit sessions), so credentials are loaded and
+    connection pools are opened once per process. Modules a service needs are
+    imported by its factory, so unused services cost nothing at startup.
+    """
+
+    def __init__(self):
+        self._factories = {}
+        self._instances = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+
+    def register(self, name: str, factory) -> None:
+        """
+        Register (or replace) how a service is built
+
+        Args:
+            name: Service name used with get()
+            factory: Callable taking the registry and returning the service;
+                it can get() other services it depends on
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+            self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str):
+        """
+        Shared instance of a service, built on first use
+
+        Raises:
+            KeyError: If no factory is registered under name
+            Exception: Whatever the factory raised; the next call tries again
+        """
+        with self._lock:
+            instance = self._instances.get(name)
+            if instance is not None:
+                self.hits += 1
+                return instance
+            if name not in self._factories:
+                raise KeyError(f"Unknown service: {name}")
+            lock = self._locks[name]
+
+        # One lock per service: a slow factory does not hold up the others
+        with lock:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is not None:
+                    self.hits += 1
+                    return instance
+                factory = self._factories[name]
+            instance = factory(self)
+            with self._lock:
+                self.builds += 1
+                # register() or reset() while the factory ran: hand out the
+                # instance, but do not keep one built by a replaced factory
+                if self._factories.get(name) is factory:
+                    self._instances.setdefault(name, instance)
+        return instance
+
+    def is_initialized(self, name: str) -> bool:
+        with self._lock:
+            return name in self._instances
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "builds": self.builds, "services": len(self._instances)}
+
+    def reset(self, name: str = None) -> None:
+        """Forget one (or every) built instance; the next get() builds it again"""
+        with self._lock:
+            if name is None:
+                self._instances.clear()
+            else:
+                self._instances.pop(name, None)
+
+
+def _credentials(registry):
+    from src.credentials import default_provider
+    return default_provider()
+
+
+def _redactor(registry):
+    from src.pii_redactor import PIIRedactor
+    from src.result_cache import MemoryCache
+    return PIIRedactor(
+        cache=MemoryCache(max_entries=256, ttl_seconds=3600),
+        credentials=registry.get("credentials"),
+    )
+
+
+def _translator(registry):
+    from src.translation_memory import TranslationMemory
+    from src.translator import MedicalTranslator
+    return MedicalTranslator(memory=TranslationMemory(), credentials=registry.get("credentials"))
+
+
+def _redact_translate(registry):
+    from src.redact_translate import RedactTranslatePipeline
+    return RedactTranslatePipeline(registry.get("redactor"), registry.get("translator"))
+
+
+def _speech(registry):
+    from src.speech_processor import SpeechProcessor
+    return SpeechProcessor(credentials=registry.get("credentials"))
+
+
+def _voice_pipeline(registry):
+    from src.voice_pipeline import VoiceRedactionPipeline
+    return VoiceRedactionPipeline(registry.get("speech"), registry.get("redactor"))
+
+
+# Shared by everything in this process, e.g. all sessions of the Streamlit UI
+# Register a MemoryCredentialProvider under "credentials" to run against local mocks
+services = ServiceRegistry()
+services.register("credentials", _credentials)
+services.register("redactor", _redactor)
+services.register("translator", _translator)
+services.register("redact_translate", _redact_translate)
+services.register("speech", _speech)
+services.register("voice_pipeline", _voice_pipeline)
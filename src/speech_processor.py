@@ -1,6 +1,58 @@
-import azure.cognitiveservices.speech as speechsdk
-import os
-from dotenv import load_dotenv
+import queue
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from functools import lru_cache
+from src.audio_input import PcmStream
+from src.credentials import default_provider
+from src.lazy_import import LazyModule
+
+# The native Speech SDK is loaded only when speech features are first used
+speechsdk = LazyModule("azure.cognitiveservices.speech")
+
+# Speech SDK offsets and durations are in 100-nanosecond ticks
+TICKS_PER_SECOND = 10_000_000
+
+# How often a waiting consumer checks whether it was asked to stop
+STOP_POLL_SECONDS = 0.1
+
+
+@lru_cache(maxsize=None)
+def _pcm_pull_callback_class():
+    """PullAudioInputStreamCallback subclass, defined once the SDK is loaded"""
+
+    class PcmPullCallback(speechsdk.audio.PullAudioInputStreamCallback):
+        """Feeds a PcmStream to the Speech SDK on demand"""
+
+        def __init__(self, pcm: PcmStream):
+            super().__init__()
+            self._pcm = pcm
+            self._chunks = iter(pcm)
+            self._pending = b""
+
+        def read(self, buffer: memoryview) -> int:
+            try:
+                while len(self._pending) < buffer.nbytes:
+                    chunk = next(self._chunks, None)
+                    if chunk is None:
+                        break
+                    self._pending += chunk
+            except Exception as e:
+                # Raising inside the SDK's thread would be lost; end the stream instead
+                self._pcm.error = str(e)
+                self._pending = b""
+            size = min(buffer.nbytes, len(self._pending))
+            buffer[:size] = self._pending[:size]
+            self._pending = self._pending[size:]
+            return size
+
+        def close(self) -> None:
+            self._pcm.close()
+
+    return PcmPullCallback
+
 
 class SpeechProcessor:
     """
@@ -8,24 +60,55 @@ class SpeechProcessor:
     Speech-to-Text for doctor voice notes
     """
     
-    def __init__(self):
-        load_dotenv()
-        key = os.getenv("SPEECH_KEY")
-        region = os.getenv("SPEECH_REGION")
-        
-        if not key or not region:
-            raise ValueError("SPEECH_KEY and SPEECH_REGION must be set")
+    def __init__(self, recognizer_factory=None, credentials=None):
+        """
+        Args:
+            recognizer_factory: Optional callable taking an audio file path and
+                returning a SpeechRecognizer-like object; replaces the Azure
+                recognizer (e.g. with a stub in tests), so no keys are needed
+            credentials: CredentialProvider for SPEECH_KEY / SPEECH_REGION
+                (process-wide default_provider() if None)
+        """
+        self.recognizer_factory = recognizer_factory
+        self.speech_config = None
+        if recognizer_factory is not None:
+            return
+
+        credentials = credentials or default_provider()
+        key, region = credentials.require("SPEECH_KEY", "SPEECH_REGION")
         
         self.speech_config = speechsdk.SpeechConfig(subscription=key, region=region)
         # Set language (you can change to other languages)
         self.speech_config.speech_recognition_language = "en-US"
-    
+
+    def _create_recognizer(self, audio):
+        """Recognizer for audio, plus the PcmStream feeding it (None for a stub factory)"""
+        if self.recognizer_factory is not None:
+            return self.recognizer_factory(audio), None
+        pcm = PcmStream(audio)
+        stream_format = speechsdk.audio.AudioStreamFormat(
+            samples_per_second=pcm.sample_rate,
+            bits_per_sample=pcm.bits_per_sample,
+            channels=pcm.channels
+        )
+        # The SDK pulls audio as it needs it, so decoding keeps pace with recognition
+        stream = speechsdk.audio.PullAudioInputStream(
+            pull_stream_callback=_pcm_pull_callback_class()(pcm),
+            stream_format=stream_format
+        )
+        recognizer = speechsdk.SpeechRecognizer(
+            speech_config=self.speech_config,
+            audio_config=speechsdk.audio.AudioConfig(stream=stream)
+        )
+        return recognizer, pcm
+
     def audio_to_text(self, audio_file_path: str) -> dict:
         """
         Convert audio file to text
         
         Args:
-            audio_file_path: Path to WAV audio file
+            audio_file_path: Path to an audio file, or the audio itself as
+                bytes or a binary file-like object (nothing is written to disk)
         
         Returns:
             {
@@ -40,11 +123,7 @@ class SpeechProcessor:
             print(result["text"])
         """
         try:
-            audio_config = speechsdk.AudioConfig(filename=audio_file_path)
-            recognizer = speechsdk.SpeechRecognizer(
-                speech_config=self.speech_config,
-                audio_config=audio_config
-            )
+            recognizer, _ = self._create_recognizer(audio_file_path)
             
             result = recognizer.recognize_once()
             
@@ -118,42 +197,195 @@ class SpeechProcessor:
                 "error": str(e)
             }
     
+    @staticmethod
+    def _segment(result, trimmed_seconds: float = 0.0) -> dict:
+        """Recognized text with its position in the original audio, in seconds"""
+        return {
+            "text": result.text,
+            "offset": result.offset / TICKS_PER_SECOND + trimmed_seconds,
+            "duration": result.duration / TICKS_PER_SECOND,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    def iter_continuous_recognition(self, audio_file_path: str, stop: threading.Event = None):
+        """
+        Stream recognized segments of a long audio file as they arrive
+
+        Recognition runs until the service reports the end of the audio
+        (session_stopped or canceled), so nothing is cut off and short files
+        finish as soon as they are transcribed.
+
+        Args:
+            audio_file_path: Path to an audio file, or audio bytes / binary file-like object
+            stop: Optional event another thread sets to end recognition early;
+                it is checked every STOP_POLL_SECONDS while waiting for audio
+
+        Yields:
+            {
+                "text": "recognized segment",
+                "offset": start in the audio (seconds),
+                "duration": length in the audio (seconds),
+                "timestamp": when the segment was recognized (ISO format)
+            }
+
+        Raises:
+            RuntimeError: If recognition is canceled with an error
+
+        Example:
+            processor = SpeechProcessor()
+            for segment in processor.iter_continuous_recognition("dictation.wav"):
+                print(f"[{segment['offset']:.1f}s] {segment['text']}")
+        """
+        segments = queue.Queue()
+        done = threading.Event()
+        errors = []
+
+        def recognized_handler(evt):
+            if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
+                # Offsets count from the first audio sent; add back trimmed leading silence
+                trimmed = pcm.leading_trimmed_seconds if pcm is not None else 0.0
+                segments.put(self._segment(evt.result, trimmed))
+
+        def stopped_handler(evt):
+            done.set()
+            # Wake the consumer; None is never a segment
+            segments.put(None)
+
+        def canceled_handler(evt):
+            if evt.cancellation_details.reason == speechsdk.CancellationReason.Error:
+                errors.append(f"Speech recognition canceled: {evt.cancellation_details.error_details}")
+            stopped_handler(evt)
+
+        recognizer, pcm = self._create_recognizer(audio_file_path)
+
+        recognizer.recognized.connect(recognized_handler)
+        recognizer.session_stopped.connect(stopped_handler)
+        recognizer.canceled.connect(canceled_handler)
+        recognizer.start_continuous_recognition()
+
+        try:
+            # Final results are delivered before session_stopped, so once the
+            # event is set and the queue is empty every segment has been seen
+            while not (done.is_set() and segments.empty()):
+                if stop is not None and stop.is_set():
+                    break
+                try:
+                    segment = segments.get(timeout=STOP_POLL_SECONDS)
+                except queue.Empty:
+                    continue
+                if segment is not None:
+                    yield segment
+        finally:
+            recognizer.stop_continuous_recognition()
+
+        if pcm is not None and pcm.error:
+            raise RuntimeError(f"Audio decoding failed: {pcm.error}")
+        if errors:
+            raise RuntimeError(errors[0])
+
     def continuous_recognition(self, audio_file_path: str) -> list:
         """
         Continuous recognition for longer audio files
         
         Args:
-            audio_file_path: Path to audio file
+            audio_file_path: Path to an audio file, or audio bytes / binary file-like object
         
         Returns:
-            List of recognized text segments
+            List of recognized text segments. If recognition fails part way,
+            the segments received before the error are still returned.
         """
         recognized_texts = []
-        
-        def recognized_handler(evt):
-            if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
-                recognized_texts.append(evt.result.text)
-        
         try:
-            audio_config = speechsdk.AudioConfig(filename=audio_file_path)
-            recognizer = speechsdk.SpeechRecognizer(
-                speech_config=self.speech_config,
-                audio_config=audio_config
-            )
-            
-            recognizer.recognized.connect(recognized_handler)
-            recognizer.start_continuous_recognition()
-            
-            import time
-            time.sleep(10)  # Adjust based on audio length
-            
-            recognizer.stop_continuous_recognition()
-            
-            return recognized_texts
+            for segment in self.iter_continuous_recognition(audio_file_path):
+                recognized_texts.append(segment["text"])
         
         except Exception as e:
             print(f"Error: {e}")
-            return []
+        
+        return recognized_texts
+
+    @staticmethod
+    def _audio_seconds(audio_file_path, segments: list) -> float:
+        """Length of a WAV file, or the end of the last segment if it cannot be read"""
+        if not isinstance(audio_file_path, str):
+            return max((s["offset"] + s["duration"] for s in segments), default=0.0)
+        try:
+            with wave.open(audio_file_path, "rb") as wav:
+                return wav.getnframes() / wav.getframerate()
+        except (OSError, EOFError, wave.Error):
+            return max((s["offset"] + s["duration"] for s in segments), default=0.0)
+
+    def _transcribe_file(self, audio_file_path: str) -> dict:
+        start = time.perf_counter()
+        segments = []
+        error = None
+        try:
+            for segment in self.iter_continuous_recognition(audio_file_path):
+                segments.append(segment)
+        except Exception as e:
+            error = str(e)
+
+        return {
+            "path": audio_file_path,
+            "text": " ".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "audio_seconds": self._audio_seconds(audio_file_path, segments),
+            "wall_seconds": time.perf_counter() - start,
+            "success": error is None,
+            "error": error,
+        }
+
+    def transcribe_batch(self, audio_file_paths: list, max_concurrency: int = 4):
+        """
+        Transcribe many audio files in parallel with continuous recognition
+
+        Up to max_concurrency files are recognized at once, each with its own
+        recognizer (a recognizer is bound to its audio input). The speech
+        config is shared. Results are yielded as files finish, so callers
+        can store or display them while the rest of the batch runs.
+
+        Args:
+            audio_file_paths: Paths to WAV audio files
+            max_concurrency: Files recognized at the same time
+
+        Yields:
+            One dict per file, in completion order:
+            {
+                "path": audio file path,
+                "text": full transcript (all segments joined),
+                "segments": iter_continuous_recognition segments,
+                "audio_seconds": length of the audio,
+                "wall_seconds": time spent on this file,
+                "success": True/False,
+                "error": "error message if failed" or None,
+                "completed": files finished so far,
+                "throughput": audio-seconds per wall-second for the batch so far
+            }
+            The last result's throughput is that of the whole batch.
+
+        Example:
+            processor = SpeechProcessor()
+            for result in processor.transcribe_batch(paths, max_concurrency=8):
+                print(result["path"], result["success"], f"{result['throughput']:.1f}x")
+        """
+        start = time.perf_counter()
+        audio_seconds = 0.0
+        completed = 0
+
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        try:
+            futures = [executor.submit(self._transcribe_file, path) for path in audio_file_paths]
+            for future in as_completed(futures):
+                result = future.result()
+                completed += 1
+                audio_seconds += result["audio_seconds"]
+                elapsed = time.perf_counter() - start
+                result["completed"] = completed
+                result["throughput"] = audio_seconds / elapsed if elapsed else 0.0
+                yield result
+        finally:
+            # A caller that stops early should not wait for files not yet started
+            executor.shutdown(wait=True, cancel_futures=True)
 
 
 # Test
@@ -168,6 +400,8 @@ if __name__ == "__main__":
     print("  1. audio_to_text(file_path) → Transcribe audio file")
     print("  2. microphone_to_text() → Real-time microphone input")
     print("  3. continuous_recognition(file_path) → Long audio files")
+    print("  4. iter_continuous_recognition(file_path) → Stream segments as they arrive")
+    print("  5. transcribe_batch(file_paths, max_concurrency) → Many files in parallel")
     
     print("\n💡 Use case: Convert doctor voice notes to text for EHR")
     print("   Example: 'Patient complains of chest pain. BP 140/90. Prescribed aspirin.'")
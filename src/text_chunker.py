@@ -0,0 +1,114 @@
+import re
+
+
+# Preferred break points, best first: paragraph, sentence, line, word
+_BREAK_PATTERNS = [
+    re.compile(r"\n\s*\n"),
+    re.compile(r"[.!?](?=\s)"),
+    re.compile(r"\n"),
+    re.compile(r"\s"),
+]
+_WHITESPACE = re.compile(r"\s+")
+# A sentence ends at . ! ? followed by whitespace, or at a line break
+_SENTENCE = re.compile(r".*?(?:[.!?](?=\s)|\n|$)\s*", re.S)
+_LAST_WORD = re.compile(r"(\S+)\.\s*$")
+# Titles never end a sentence ("Dr. Lee"); abbreviations only when a capital follows
+_TITLES = {"dr", "mr", "mrs", "ms", "prof", "st", "sr", "jr", "pt"}
+_ABBREVIATIONS = {
+    "mg", "mcg", "g", "kg", "ml", "l", "cm", "mm", "hr", "hrs", "min", "approx",
+    "e.g", "i.e", "vs", "no", "tab", "tabs", "cap", "caps", "p.o", "q.d", "b.i.d", "t.i.d",
+}
+
+
+def _find_break(text: str, start: int, end: int, min_chunk: int) -> int:
+    """Return the best cut position in text[start + min_chunk:end], or end if none"""
+    window_start = start + min_chunk
+    for pattern in _BREAK_PATTERNS:
+        last = None
+        for match in pattern.finditer(text, window_start, end):
+            last = match
+        if last is not None:
+            return last.end()
+    return end
+
+
+def split_text(text: str, max_chars: int, overlap: int = 0) -> list:
+    """
+    Split text into chunks of at most max_chars characters
+
+    Cuts on paragraph, then sentence, then line, then word boundaries and
+    only falls back to a hard cut when a single word is longer than a chunk.
+    Consecutive chunks share about `overlap` characters so entities that
+    straddle a cut are seen whole in at least one chunk.
+
+    Args:
+        text: Text to split
+        max_chars: Maximum characters per chunk
+        overlap: Characters repeated at the start of the next chunk
+
+    Returns:
+        List of (offset, chunk) tuples where text[offset:offset + len(chunk)] == chunk
+
+    Example:
+        for offset, chunk in split_text(discharge_summary, 5120, overlap=200):
+            ...
+    """
+    if len(text) <= max_chars:
+        return [(0, text)]
+
+    overlap = max(0, min(overlap, max_chars // 2))
+    chunks = []
+    start = 0
+    while True:
+        end = start + max_chars
+        if end >= len(text):
+            chunks.append((start, text[start:]))
+            return chunks
+
+        cut = _find_break(text, start, end, min_chunk=max_chars // 2)
+        chunks.append((start, text[start:cut]))
+
+        # Start the next chunk at a word boundary inside the overlap window
+        next_start = cut - overlap
+        if overlap:
+            match = _WHITESPACE.search(text, next_start, cut)
+            if match is not None:
+                next_start = match.end()
+        start = max(next_start, start + 1)
+
+
+def split_sentences(text: str) -> list:
+    """
+    Split text into sentences, keeping the whitespace after each one
+
+    Decimal points such as "7.2%" do not end a sentence, nor do titles such as
+    "Dr." or abbreviations such as "mg." followed by a lower-case word. Joining
+    the result gives back the original text.
+
+    Example:
+        split_sentences("Seen by Dr. Lee. Take 7.2 mg. p.o. daily.\n")
+        -> ["Seen by Dr. Lee. ", "Take 7.2 mg. p.o. daily.\n"]
+    """
+    sentences = []
+    for match in _SENTENCE.finditer(text):
+        piece = match.group()
+        if not piece:
+            continue
+        if sentences and _continues(sentences[-1], piece):
+            sentences[-1] += piece
+        else:
+            sentences.append(piece)
+    return sentences
+
+
+def _continues(previous: str, piece: str) -> bool:
+    """True if previous ended on an abbreviation rather than a sentence end"""
+    if previous.endswith("\n"):
+        return False
+    match = _LAST_WORD.search(previous)
+    if match is None:
+        return False
+    word = match.group(1).lower()
+    if word in _TITLES or (len(word) == 1 and word.isalpha() and match.group(1).isupper()):
+        return True
+    return word in _ABBREVIATIONS and not piece.lstrip()[:1].isupper()
@@ -0,0 +1,87 @@
+from src.result_cache import MemoryCache, SQLiteCache, make_cache_key
+
+
+class TranslationMemory:
+    """
+    Segment-level translation memory
+    In-process cache in front of an optional persistent SQLite store
+    Keys are hashed, but stored translations are plaintext, so the SQLite
+    store is only for redacted text (RedactTranslatePipeline(memory_path=...)).
+    Translations of raw clinical notes stay in process.
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        max_entries: int = 10000,
+        max_stored_entries: int = 1000000,
+        ttl_seconds: float = None,
+        policy: str = "lru",
+        redacted_input: bool = False,
+    ):
+        """
+        Args:
+            path: SQLite file for the persistent store (None = in-process only);
+                requires redacted_input=True
+            max_entries: Segments kept in process
+            max_stored_entries: Segments kept in the SQLite store
+            ttl_seconds: Age after which a stored translation is fetched again
+            policy: Eviction policy for both tiers, "lru" or "fifo"
+            redacted_input: Caller's promise that every segment has had its PHI
+                replaced by placeholders, so translations may be written to disk
+
+        Raises:
+            ValueError: If path is given without redacted_input=True
+
+        Example:
+            memory = TranslationMemory("data/cache/translation_memory.sqlite", redacted_input=True)
+            translator = MedicalTranslator(memory=memory)
+        """
+        if path and not redacted_input:
+            raise ValueError(
+                "A persistent translation memory stores translations in plaintext; "
+                "use it only for redacted text (redacted_input=True)"
+            )
+        self.memory = MemoryCache(max_entries=max_entries, ttl_seconds=ttl_seconds, policy=policy)
+        self.store = None
+        if path:
+            self.store = SQLiteCache(path, max_entries=max_stored_entries, ttl_seconds=ttl_seconds, policy=policy)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(segment: str, from_lang: str, to_lang: str, api_version: str, text_type: str) -> str:
+        return make_cache_key("translation", segment, from_lang, to_lang, api_version, text_type)
+
+    def get(self, segment: str, from_lang: str, to_lang: str, api_version: str = "3.0", text_type: str = "plain"):
+        """Cached translation of segment, or None"""
+        key = self._key(segment, from_lang, to_lang, api_version, text_type)
+        value = self.memory.get(key)
+        if value is None and self.store is not None:
+            value = self.store.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, segment: str, from_lang: str, to_lang: str, translation: str,
+            api_version: str = "3.0", text_type: str = "plain") -> None:
+        key = self._key(segment, from_lang, to_lang, api_version, text_type)
+        self.memory.set(key, translation)
+        if self.store is not None:
+            self.store.set(key, translation)
+
+    def stats(self) -> dict:
+        """Hit/miss counters across both tiers, plus per-tier details"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "memory": self.memory.stats(),
+            "store": self.store.stats() if self.store is not None else None,
+        }
@@ -1,7 +1,105 @@
-import os
 import requests
 import uuid
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.credentials import default_provider
+from src.language_id import identify_language
+from src.text_chunker import split_sentences, split_text
+
+# Translator v3 request limits: array elements per request and characters per
+# request. Characters are counted once per target language to stay safe when
+# one request fans out to several languages.
+MAX_TEXTS_PER_REQUEST = 1000
+MAX_CHARS_PER_REQUEST = 50000
+
+API_VERSION = '3.0'
+
+
+def pack_requests(segments: list, target_count: int, max_chars: int = MAX_CHARS_PER_REQUEST) -> list:
+    """
+    Group segment indexes into requests that respect the Translator limits
+    max_chars can lower the per-request character limit (e.g. to a rate limiter's burst)
+    """
+    batches = []
+    current = []
+    current_chars = 0
+    for index, segment in enumerate(segments):
+        chars = len(segment) * target_count
+        if current and (len(current) == MAX_TEXTS_PER_REQUEST or current_chars + chars > max_chars):
+            batches.append(current)
+            current = []
+            current_chars = 0
+        current.append(index)
+        current_chars += chars
+    if current:
+        batches.append(current)
+    return batches
+
+
+def split_segments(texts: list, target_count: int, by_sentence: bool = False,
+                   max_chars: int = MAX_CHARS_PER_REQUEST) -> tuple:
+    """
+    Cut texts into segments that fit a request of max_chars characters
+
+    Returns:
+        (segments, owners): every segment in order, and the index of the text
+        each one came from
+    """
+    max_segment_chars = max(1, max_chars // target_count)
+    segments = []
+    owners = []
+    for text_index, text in enumerate(texts):
+        pieces = split_sentences(text) if by_sentence else [text]
+        for piece in pieces:
+            for _, chunk in split_text(piece, max_segment_chars):
+                segments.append(chunk)
+                owners.append(text_index)
+    return segments, owners
+
+
+def read_translations(items, keys: list, translations: dict, errors: dict) -> None:
+    """
+    Store one /translate response body into translations[key] = {lang: text}
+    keys lists the segments sent, in request order. Segments the response has
+    no usable entry for (short or malformed body) get an entry in errors.
+    """
+    try:
+        for key, item in zip(keys, items):
+            translations[key] = {t['to']: t['text'] for t in item['translations']}
+    except (KeyError, TypeError) as e:
+        message = f"Malformed Translator response: {e!r}"
+    else:
+        message = "No translation returned for this segment"
+    for key in keys:
+        if translations.get(key) is None:
+            errors[key] = message
+
+
+def join_translations(texts: list, segments: list, owners: list, to_langs: list, translations: dict, errors: dict) -> list:
+    """
+    Reassemble per-segment translations into one result dict per text
+
+    translations and errors are keyed by the stripped segment; a text takes
+    the first error of any of its segments.
+    """
+    results = [{"text": text, "translations": {lang: "" for lang in to_langs}, "error": None} for text in texts]
+    for segment, text_index in zip(segments, owners):
+        result = results[text_index]
+        key = segment.strip()
+        if not key:
+            for lang in to_langs:
+                result["translations"][lang] += segment
+            continue
+        if key in errors or translations.get(key) is None:
+            result["error"] = result["error"] or errors.get(key, "No translation returned for this segment")
+            continue
+        # The service trims segments; keep the original spacing between them
+        leading = segment[:len(segment) - len(segment.lstrip())]
+        trailing = segment[len(segment.rstrip()):]
+        for lang in to_langs:
+            result["translations"][lang] += leading + translations[key].get(lang, "").strip() + trailing
+    return results
+
 
 class MedicalTranslator:
     """
@@ -9,11 +107,69 @@ class MedicalTranslator:
     Supports 100+ languages
     """
     
-    def __init__(self):
-        load_dotenv()
-        self.key = os.getenv("TRANSLATOR_KEY")
-        self.endpoint = os.getenv("TRANSLATOR_ENDPOINT", "https://api.cognitive.microsofttranslator.com")
-        self.region = os.getenv("TRANSLATOR_REGION", "global")
+    def __init__(
+        self,
+        pool_size: int = 10,
+        timeout: tuple = (3.05, 30),
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        memory=None,
+        local_detection_threshold: float = 0.5,
+        credentials=None,
+    ):
+        """
+        Args:
+            pool_size: Keep-alive connections kept open to the Translator endpoint
+            timeout: (connect, read) timeout in seconds for every request
+            max_retries: Retries for connection errors, 429 and 5xx responses
+            backoff_factor: Exponential backoff base in seconds; Retry-After wins when sent
+            memory: Optional TranslationMemory; cached sentences are never sent again
+            local_detection_threshold: Minimum confidence for detect_language to trust
+                the local identifier instead of calling /detect (None = always call /detect)
+            credentials: CredentialProvider for TRANSLATOR_KEY / _ENDPOINT / _REGION
+                (process-wide default_provider() if None)
+        """
+        credentials = credentials or default_provider()
+        self.key = credentials.get("TRANSLATOR_KEY")
+        self.endpoint = credentials.get("TRANSLATOR_ENDPOINT", "https://api.cognitive.microsofttranslator.com")
+        self.region = credentials.get("TRANSLATOR_REGION", "global")
+        self.timeout = timeout
+        self.memory = memory
+        self.local_detection_threshold = local_detection_threshold
+
+        # One pooled session reuses TCP/TLS connections across calls
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["POST"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            'Ocp-Apim-Subscription-Key': self.key,
+            'Ocp-Apim-Subscription-Region': self.region,
+            'Content-type': 'application/json'
+        })
+
+    def _post(self, path: str, params: dict, body: list, headers: dict = None) -> requests.Response:
+        response = self.session.post(
+            self.endpoint + path,
+            params=params,
+            headers=headers,
+            json=body,
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response
+
+    def close(self) -> None:
+        """Release pooled connections"""
+        self.session.close()
     
     def translate(self, text: str, from_lang: str = "en", to_lang: str = "tr") -> str:
         """
@@ -31,47 +187,111 @@ class MedicalTranslator:
             translator = MedicalTranslator()
             turkish = translator.translate("Patient has diabetes", "en", "tr")
         """
-        path = '/translate'
-        url = self.endpoint + path
-        
-        params = {
-            'api-version': '3.0',
-            'from': from_lang,
-            'to': to_lang
-        }
-        
-        headers = {
-            'Ocp-Apim-Subscription-Key': self.key,
-            'Ocp-Apim-Subscription-Region': self.region,
-            'Content-type': 'application/json',
-            'X-ClientTraceId': str(uuid.uuid4())
-        }
-        
-        body = [{'text': text}]
-        
-        try:
-            response = requests.post(url, params=params, headers=headers, json=body)
-            response.raise_for_status()
-            result = response.json()
-            return result[0]['translations'][0]['text']
-        except Exception as e:
-            return f"Translation error: {str(e)}"
+        result = self.translate_many([text], from_lang=from_lang, to_langs=[to_lang])[0]
+        if result["error"]:
+            return f"Translation error: {result['error']}"
+        return result["translations"][to_lang]
+
+    def _recall(self, segment: str, from_lang: str, to_langs: list, text_type: str):
+        """All target translations of segment from the memory, or None if any is missing"""
+        found = {}
+        for lang in to_langs:
+            translation = self.memory.get(segment, from_lang, lang, API_VERSION, text_type)
+            if translation is None:
+                return None
+            found[lang] = translation
+        return found
+
+    def translate_many(self, texts: list, from_lang: str = "en", to_langs: list = None, text_type: str = "plain") -> list:
+        """
+        Translate many texts into one or more languages with as few requests as possible
+
+        Texts are packed into array bodies under the Translator's element and
+        character limits, and all target languages are requested at once.
+        Texts too long for a single request are split on sentence boundaries
+        and joined back afterwards. Identical segments are sent only once.
+
+        With a translation memory, texts are split into sentences and only
+        sentences the memory has not seen are sent to Azure.
+
+        Args:
+            texts: Texts to translate
+            from_lang: Source language code, or None to let the service detect it
+            to_langs: Target language codes (e.g., ['tr', 'de', 'fr'])
+            text_type: 'plain' or 'html'
+
+        Returns:
+            One dict per input text, in order:
+            {
+                "text": original text,
+                "translations": {"tr": "...", "de": "..."},
+                "error": "error message if failed" or None
+            }
+
+        Example:
+            translator = MedicalTranslator()
+            results = translator.translate_many(lines, "en", ["tr", "de", "fr"])
+        """
+        to_langs = list(to_langs or ["tr"])
+
+        # Split texts into segments; remember which segments belong to which text
+        segments, owners = split_segments(texts, len(to_langs), by_sentence=self.memory is not None)
+
+        # Each distinct segment is translated once; the memory answers known ones
+        translations = {}
+        errors = {}
+        misses = []
+        for segment in segments:
+            key = segment.strip()
+            if not key or key in translations:
+                continue
+            cached = self._recall(key, from_lang, to_langs, text_type) if self.memory is not None else None
+            translations[key] = cached
+            if cached is None:
+                misses.append(key)
+
+        params = {'api-version': API_VERSION, 'to': to_langs, 'textType': text_type}
+        if from_lang:
+            params['from'] = from_lang
+
+        for indexes in pack_requests(misses, len(to_langs)):
+            keys = [misses[i] for i in indexes]
+            body = [{'text': key} for key in keys]
+            try:
+                response = self._post('/translate', params, body, headers={'X-ClientTraceId': str(uuid.uuid4())})
+                read_translations(response.json(), keys, translations, errors)
+            except Exception as e:
+                for key in keys:
+                    errors[key] = str(e)
+                continue
+            if self.memory is not None:
+                for key in keys:
+                    for lang, translation in (translations[key] or {}).items():
+                        self.memory.set(key, from_lang, lang, translation, API_VERSION, text_type)
+
+        return join_translations(texts, segments, owners, to_langs, translations, errors)
+
+    def memory_stats(self):
+        """Hit/miss counters of the translation memory, or None if it is off"""
+        return self.memory.stats() if self.memory is not None else None
     
     def detect_language(self, text: str) -> str:
-        """Detect language of text"""
-        path = '/detect'
-        url = self.endpoint + path
-        
-        params = {'api-version': '3.0'}
-        headers = {
-            'Ocp-Apim-Subscription-Key': self.key,
-            'Ocp-Apim-Subscription-Region': self.region,
-            'Content-type': 'application/json'
-        }
+        """
+        Detect language of text
+
+        Confident local guesses for the UI languages are returned without a
+        network call; everything else goes to the /detect endpoint.
+        """
+        if self.local_detection_threshold is not None:
+            lang, confidence = identify_language(text)
+            if lang and confidence >= self.local_detection_threshold:
+                return lang
+
+        params = {'api-version': API_VERSION}
         body = [{'text': text}]
         
         try:
-            response = requests.post(url, params=params, headers=headers, json=body)
+            response = self._post('/detect', params, body)
             result = response.json()
             return result[0]['language']
         except Exception as e:
@@ -93,7 +313,11 @@ if __name__ == "__main__":
     print("MEDICAL TEXT TRANSLATION")
     print("=" * 70)
     
-    for text in examples:
-        print(f"\n📝 Original (EN): {text}")
-        print(f"🇹🇷 Turkish: {translator.translate(text, 'en', 'tr')}")
-        print(f"🇩🇪 German: {translator.translate(text, 'en', 'de')}")
\ No newline at end of file
+    # One request translates every example into both languages
+    for result in translator.translate_many(examples, 'en', ['tr', 'de']):
+        print(f"\n📝 Original (EN): {result['text']}")
+        if result["error"]:
+            print(f"❌ Translation error: {result['error']}")
+            continue
+        print(f"🇹🇷 Turkish: {result['translations']['tr']}")
+        print(f"🇩🇪 German: {result['translations']['de']}")
\ No newline at end of file
@@ -0,0 +1,174 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.pii_redactor import PIIRedactor
+from src.speech_processor import STOP_POLL_SECONDS, SpeechProcessor
+
+# Segments being analyzed at once while recognition keeps running
+MAX_SEGMENTS_IN_FLIGHT = 4
+
+# Stands in for a segment whose detection failed, since PHI may be left in it
+REDACTION_FAILED = "[REDACTION FAILED]"
+
+_DONE = object()
+
+
+class VoiceRedactionPipeline:
+    """
+    Voice note -> redacted text, one recognized segment at a time
+    Each finalized segment is sent for PII/healthcare detection as soon as
+    Speech delivers it, so the redacted transcript is ready moments after
+    the audio ends instead of after a second pass over the whole transcript.
+    """
+
+    def __init__(
+        self,
+        speech: SpeechProcessor = None,
+        redactor: PIIRedactor = None,
+        max_in_flight: int = MAX_SEGMENTS_IN_FLIGHT,
+    ):
+        """
+        Args:
+            speech: SpeechProcessor to transcribe with (a new one by default)
+            redactor: PIIRedactor to analyze segments with (a new one by default)
+            max_in_flight: Segments analyzed concurrently while recognition runs
+        """
+        self.speech = speech or SpeechProcessor()
+        self.redactor = redactor or PIIRedactor()
+        self.max_in_flight = max_in_flight
+
+    def _analyze_segment(self, segment: dict) -> dict:
+        result = self.redactor.process_documents([segment["text"]])[0]
+        return {
+            **segment,
+            # A failed detector means the redaction may be incomplete: withhold it all
+            "redacted_text": REDACTION_FAILED if result["errors"] else result["redacted_text"],
+            "healthcare_entities": result["healthcare_entities"],
+            "medical_entities": result["medical_entities"],
+            "pii_entities": result["pii_entities"],
+            "errors": result["errors"],
+        }
+
+    def iter_redacted_segments(self, audio_file_path: str):
+        """
+        Transcribe audio and yield each segment redacted, in spoken order
+
+        Recognition runs on a background thread and keeps going while earlier
+        segments are analyzed. Entity offsets are relative to the segment text.
+        Detection sees one utterance at a time, so an entity split across
+        two utterances may be missed.
+
+        Args:
+            audio_file_path: Path to an audio file, or audio bytes / binary file-like object
+
+        Yields:
+            iter_continuous_recognition segments plus "redacted_text",
+            "healthcare_entities", "medical_entities", "pii_entities" and "errors".
+            If detection failed for a segment, its "errors" are set and its
+            "redacted_text" is REDACTION_FAILED rather than the transcript.
+
+        Raises:
+            RuntimeError: If recognition is canceled with an error
+
+        Example:
+            pipeline = VoiceRedactionPipeline()
+            for segment in pipeline.iter_redacted_segments("dictation.wav"):
+                print(segment["redacted_text"])
+        """
+        pending = queue.Queue(maxsize=self.max_in_flight)
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=self.max_in_flight)
+
+        def offer(item) -> bool:
+            # Waits once max_in_flight segments are queued, like iter_batch,
+            # but gives up as soon as the consumer has gone away
+            while not stop.is_set():
+                try:
+                    pending.put(item, timeout=STOP_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def recognize():
+            try:
+                # stop ends recognition within STOP_POLL_SECONDS, even mid-utterance
+                for segment in self.speech.iter_continuous_recognition(audio_file_path, stop=stop):
+                    if not offer(executor.submit(self._analyze_segment, segment)):
+                        break
+                offer(_DONE)
+            except Exception as e:
+                offer(e)
+
+        recognizer_thread = threading.Thread(target=recognize, daemon=True)
+        recognizer_thread.start()
+
+        try:
+            while True:
+                item = pending.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item.result()
+        finally:
+            # The recognizer thread sees stop within STOP_POLL_SECONDS, stops
+            # the Speech session and exits; nothing here waits for the audio to end
+            stop.set()
+            recognizer_thread.join()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def transcribe_and_redact(self, audio_file_path: str) -> dict:
+        """
+        Transcribe and redact a whole voice note
+
+        Returns:
+            PIIRedactor.process_document-style dict for the full transcript,
+            with entity offsets relative to "original_text", plus "segments"
+            and "errors". Segments whose detection failed appear in
+            "redacted_text" as REDACTION_FAILED.
+
+        Example:
+            pipeline = VoiceRedactionPipeline()
+            result = pipeline.transcribe_and_redact("dictation.wav")
+            print(result["redacted_text"])
+        """
+        result = {
+            "original_text": "",
+            "healthcare_entities": [],
+            "medical_entities": [],
+            "pii_entities": [],
+            "redacted_text": "",
+            "segments": [],
+            "errors": [],
+        }
+
+        # Segments are joined with single spaces, both before and after redaction
+        for segment in self.iter_redacted_segments(audio_file_path):
+            separator = " " if result["segments"] else ""
+            offset = len(result["original_text"]) + len(separator)
+            result["original_text"] += separator + segment["text"]
+            result["redacted_text"] += separator + segment["redacted_text"]
+            for key in ("healthcare_entities", "medical_entities", "pii_entities"):
+                result[key].extend({**entity, "offset": entity["offset"] + offset} for entity in segment[key])
+            result["errors"].extend(segment["errors"])
+            result["segments"].append(segment)
+
+        result["total_entities"] = (
+            len(result["healthcare_entities"]) + len(result["medical_entities"]) + len(result["pii_entities"])
+        )
+        return result
+
+
+# Test
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m src.voice_pipeline <audio.wav>")
+        sys.exit(1)
+
+    pipeline = VoiceRedactionPipeline()
+    for segment in pipeline.iter_redacted_segments(sys.argv[1]):
+        print(f"[{segment['offset']:7.1f}s] {segment['redacted_text']}")
@@ -4,11 +4,19 @@ import os
 import base64
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.pii_redactor import PIIRedactor
-from src.translator import MedicalTranslator
-from src.speech_processor import SpeechProcessor
+from src.entity_renderer import highlight_entities, highlight_placeholders
+from src.service_registry import services
 import json
 
+# Placeholder colours shared by the Analyze and Batch views
+PII_PLACEHOLDER_COLORS = {
+    '[PERSON]': '#1976D2',
+    '[EMAIL]': '#D32F2F',
+    '[PHONE]': '#D32F2F',
+    '[SSN]': '#D32F2F',
+    '[DATE]': '#1976D2'
+}
+
 st.set_page_config(
     page_title="Healthcare NLP Analyzer",
     page_icon="🏥",
@@ -183,16 +191,15 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Initialize services
-if 'redactor' not in st.session_state:
-    try:
-        st.session_state.redactor = PIIRedactor()
-        st.session_state.translator = MedicalTranslator()
-        st.session_state.speech = SpeechProcessor()
-        st.session_state.initialized = True
-    except Exception as e:
-        st.error(f"❌ Initialization failed: {e}")
-        st.info("💡 Check your .env file and Azure credentials")
-        st.stop()
+# Clients are shared by every session in this process and built on first use;
+# the Speech SDK is only loaded once someone uses the Voice tab
+try:
+    services.get("redactor")
+    services.get("translator")
+except Exception as e:
+    st.error(f"❌ Initialization failed: {e}")
+    st.info("💡 Check your .env file and Azure credentials")
+    st.stop()
 
 # ENHANCED SIDEBAR
 with st.sidebar:
@@ -267,7 +274,7 @@ with st.sidebar:
     """)
     
     st.markdown("---")
-    st.markdown(f"**Status:** {'🟢 All systems operational' if st.session_state.initialized else '🔴 Initialization failed'}")
+    st.markdown(f"**Status:** {'🟢 All systems operational' if services.is_initialized('redactor') else '🔴 Initialization failed'}")
 
 # MAIN TABS
 tab1, tab2, tab3, tab4, tab5 = st.tabs([
@@ -306,7 +313,7 @@ Contact: sjohnson@email.com, +1-555-1234""",
     if st.button("🔍 Analyze & Redact", type="primary", use_container_width=True):
         if text_input.strip():
             with st.spinner("🔄 Processing with Azure AI Healthcare Analytics..."):
-                result = st.session_state.redactor.process_document(text_input)
+                result = services.get("redactor").process_document(text_input)
 
             # Color mapping
             healthcare_colors = {
@@ -338,23 +345,8 @@ Contact: sjohnson@email.com, +1-555-1234""",
             with col_output:
                 st.markdown("**🔒 Redacted Text (PHI Removed):**")
                 
-                # Create highlighted redacted text
-                redacted_highlighted = result["redacted_text"]
-                
                 # Highlight PII placeholders in redacted text
-                pii_placeholders = {
-                    '[PERSON]': '#1976D2',
-                    '[EMAIL]': '#D32F2F',
-                    '[PHONE]': '#D32F2F',
-                    '[SSN]': '#D32F2F',
-                    '[DATE]': '#1976D2'
-                }
-                
-                for placeholder, color in pii_placeholders.items():
-                    redacted_highlighted = redacted_highlighted.replace(
-                        placeholder,
-                        f'<span style="background-color: {color}; color: white; padding: 2px 6px; border-radius: 4px; font-weight: bold;">{placeholder}</span>'
-                    )
+                redacted_highlighted = highlight_placeholders(result["redacted_text"], PII_PLACEHOLDER_COLORS)
                 
                 st.markdown(
                     f'<div style="background-color: #1a1a1a; padding: 1rem; border-radius: 8px; height: 400px; overflow-y: auto; line-height: 1.8;">{redacted_highlighted}</div>',
@@ -364,53 +356,18 @@ Contact: sjohnson@email.com, +1-555-1234""",
             with col_entities:
                 st.markdown("**🏷️ All Detected Entities:**")
                 
-                # Create highlighted version of ORIGINAL text with ALL entities colored
-                highlighted_text = text_input
-                
-                # Collect all entities
-                all_entities = []
-                
-                # Healthcare (green)
-                for e in result["healthcare_entities"]:
-                    all_entities.append({
-                        'text': e['text'],
-                        'color': healthcare_colors.get(e['category'], '#4CAF50'),
-                        'category': e['category']
-                    })
-                
-                # Medical (blue)
-                for e in result["medical_entities"]:
-                    all_entities.append({
-                        'text': e['text'],
-                        'color': medical_colors.get(e['category'], '#1976D2'),
-                        'category': e['category']
-                    })
-                
-                # PII (red)
-                for e in result["pii_entities"]:
-                    all_entities.append({
-                        'text': e['text'],
-                        'color': '#D32F2F',
-                        'category': e['category']
-                    })
-                
-                # Remove duplicates (keep first occurrence)
-                seen = set()
-                unique_entities = []
-                for e in all_entities:
-                    if e['text'] not in seen:
-                        seen.add(e['text'])
-                        unique_entities.append(e)
-                
-                # Apply highlighting to original text
-                for entity in unique_entities:
-                    entity_text = entity['text']
-                    color = entity['color']
-                    
-                    replacement = f'<span style="background-color: {color}; color: white; padding: 3px 7px; border-radius: 4px; font-weight: 600; margin: 1px;">{entity_text}</span>'
-                    
-                    # Replace all occurrences
-                    highlighted_text = highlighted_text.replace(entity_text, replacement)
+                # Highlight ALL entities in the ORIGINAL text, placed by offset
+                entity_colors = {
+                    **{e['category']: healthcare_colors.get(e['category'], '#4CAF50') for e in result["healthcare_entities"]},
+                    **{e['category']: medical_colors.get(e['category'], '#1976D2') for e in result["medical_entities"]},
+                    **{e['category']: '#D32F2F' for e in result["pii_entities"]},
+                }
+                highlighted_text = highlight_entities(
+                    text_input,
+                    result["healthcare_entities"] + result["medical_entities"] + result["pii_entities"],
+                    entity_colors,
+                    style="background-color: {color}; color: white; padding: 3px 7px; border-radius: 4px; font-weight: 600; margin: 1px;"
+                )
                 
                 # Display
                 st.markdown(
@@ -568,17 +525,38 @@ with tab2:
             index=1
         )
     
+        redact_first = st.checkbox(
+            "🔒 Redact PHI before translating",
+            value=False,
+            help="Names, dates and contact details are replaced with placeholders and never sent to the Translator"
+        )
+    
     if st.button("🌐 Translate", type="primary", use_container_width=True):
         if translate_input.strip():
             if from_lang[1] == to_lang[1]:
                 st.warning("⚠️ Source and target languages are the same. Please select different languages.")
             else:
                 with st.spinner("🔄 Translating with Azure Translator..."):
-                    translated = st.session_state.translator.translate(
-                        translate_input,
-                        from_lang=from_lang[1],
-                        to_lang=to_lang[1]
-                    )
+                    if redact_first:
+                        try:
+                            pipeline_result = services.get("redact_translate").process_document(
+                                translate_input,
+                                from_lang=from_lang[1],
+                                to_lang=to_lang[1]
+                            )
+                        except ValueError as e:
+                            # Source language without PHI detection: refuse rather than send PHI
+                            pipeline_result = {"translation_error": str(e)}
+                        if pipeline_result["translation_error"]:
+                            translated = f"Translation error: {pipeline_result['translation_error']}"
+                        else:
+                            translated = pipeline_result["translated_text"]
+                    else:
+                        translated = services.get("translator").translate(
+                            translate_input,
+                            from_lang=from_lang[1],
+                            to_lang=to_lang[1]
+                        )
                 
                 st.markdown("---")
                 st.markdown(
@@ -646,7 +624,7 @@ with tab3:
             <li><strong>Audio File Upload:</strong> WAV, MP3, M4A formats supported</li>
             <li><strong>Live Recording:</strong> Record directly from your microphone</li>
             <li><strong>Medical Accuracy:</strong> Optimized for medical terminology</li>
-            <li><strong>Instant Analysis:</strong> Automatically detect PII in transcriptions</li>
+            <li><strong>Instant Analysis:</strong> PII is redacted segment by segment while transcribing</li>
         </ul>
     </div>
     """, unsafe_allow_html=True)
@@ -668,25 +646,58 @@ with tab3:
         )
         
         if audio_file:
-            st.audio(audio_file, format="audio/wav")
+            st.audio(audio_file, format=audio_file.type or "audio/wav")
             
             if st.button("🎤 Transcribe Audio", type="primary", use_container_width=True):
-                with open("temp_audio.wav", "wb") as f:
-                    f.write(audio_file.read())
+                st.markdown("---")
+                st.markdown("**🔒 Redacted Transcript (live):**")
+                live_redacted = st.empty()
+                original_segments = []
+                redacted_segments = []
+                entity_count = 0
+                failed_segments = []
+                error = None
                 
-                with st.spinner("🔄 Transcribing with Azure Speech..."):
-                    result = st.session_state.speech.audio_to_text("temp_audio.wav")
+                # Audio is decoded and streamed from memory; nothing is written to disk.
+                # Each segment is redacted as soon as Speech finalizes it
+                with st.spinner("🔄 Transcribing and redacting with Azure Speech + Language..."):
+                    try:
+                        for segment in services.get("voice_pipeline").iter_redacted_segments(audio_file.getvalue()):
+                            original_segments.append(segment["text"])
+                            # Failed segments arrive as [REDACTION FAILED], never as raw text
+                            redacted_segments.append(segment["redacted_text"])
+                            if segment["errors"]:
+                                failed_segments.append(segment["errors"][0])
+                                continue
+                            entity_count += len(segment["medical_entities"]) + len(segment["pii_entities"])
+                            live_redacted.markdown(
+                                f'<div style="background-color: #1a1a1a; padding: 1rem; border-radius: 8px; line-height: 1.8;">'
+                                f'{highlight_placeholders(" ".join(redacted_segments), PII_PLACEHOLDER_COLORS)}'
+                                f'</div>',
+                                unsafe_allow_html=True
+                            )
+                    except Exception as e:
+                        error = str(e)
                 
-                if os.path.exists("temp_audio.wav"):
-                    os.remove("temp_audio.wav")
+                transcript = " ".join(original_segments)
+                redacted_transcript = " ".join(redacted_segments)
                 
-                if result["success"]:
-                    st.markdown("---")
-                    st.success("✅ Transcription Complete!")
+                if error:
+                    st.error(f"❌ Transcription failed: {error}")
+                elif not original_segments:
+                    st.error("❌ Transcription failed: No speech could be recognized")
+                else:
+                    if failed_segments:
+                        st.error(
+                            f"❌ PHI detection failed for {len(failed_segments)} of {len(original_segments)} segments "
+                            f"({failed_segments[0]}); they are withheld from the redacted transcript"
+                        )
+                    else:
+                        st.success(f"✅ Transcription Complete! {entity_count} PHI/medical entities redacted")
                     
                     st.text_area(
                         "Transcribed Text:",
-                        value=result["text"],
+                        value=transcript,
                         height=200,
                         key="transcribed_text"
                     )
@@ -695,20 +706,22 @@ with tab3:
                     with col1:
                         st.download_button(
                             label="📥 Download Transcription",
-                            data=result["text"],
+                            data=transcript,
                             file_name="transcription.txt",
                             mime="text/plain",
                             use_container_width=True
                         )
                     
                     with col2:
-                        if st.button("🔍 Analyze for PII", use_container_width=True):
-                            with st.spinner("Analyzing..."):
-                                analysis = st.session_state.redactor.process_document(result["text"])
-                            st.success(f"✅ Found {analysis['total_entities']} entities ({len(analysis['pii_entities'])} PII)")
-                
-                else:
-                    st.error(f"❌ Transcription failed: {result['error']}")
+                        st.download_button(
+                            label="🔒 Download Redacted Transcript",
+                            data=redacted_transcript,
+                            file_name="transcription_redacted.txt",
+                            mime="text/plain",
+                            use_container_width=True,
+                            disabled=bool(failed_segments),
+                            help="Unavailable: redaction failed for part of the audio" if failed_segments else None
+                        )
         
         else:
             st.info("👆 Upload an audio file to start transcription")
@@ -727,7 +740,10 @@ with tab3:
         
         if st.button("🔴 Start Recording", type="primary", use_container_width=True):
             with st.spinner("🎤 Listening... Speak now!"):
-                result = st.session_state.speech.microphone_to_text()
+                try:
+                    result = services.get("speech").microphone_to_text()
+                except Exception as e:
+                    result = {"text": "", "success": False, "error": str(e)}
             
             if result["success"]:
                 st.markdown("---")
@@ -753,7 +769,7 @@ with tab3:
                 with col2:
                     if st.button("🔍 Analyze for PII", use_container_width=True, key="analyze_live"):
                         with st.spinner("Analyzing..."):
-                            analysis = st.session_state.redactor.process_document(result["text"])
+                            analysis = services.get("redactor").process_document(result["text"])
                         st.success(f"✅ Found {analysis['total_entities']} entities")
             
             else:
@@ -817,7 +833,7 @@ with tab4:
                             st.error("⚠️ python-docx not installed. Run: `pip install python-docx`")
                             continue
                     
-                    doc_result = st.session_state.redactor.process_document(text)
+                    doc_result = services.get("redactor").process_document(text)
                     batch_results.append({
                         "filename": f.name,
                         "result": doc_result,
@@ -844,6 +860,12 @@ with tab4:
             st.markdown("---")
             for r in batch_results:
                 with st.expander(f"📄 {r['filename']} — {r['result']['total_entities']} entities found"):
+                    st.markdown(
+                        f'<div style="background-color: #1a1a1a; padding: 1rem; border-radius: 8px; max-height: 300px; overflow-y: auto; line-height: 1.8;">'
+                        f'{highlight_placeholders(r["result"]["redacted_text"], PII_PLACEHOLDER_COLORS)}'
+                        f'</div>',
+                        unsafe_allow_html=True
+                    )
                     st.text_area(
                         "Redacted text:",
                         value=r["result"]["redacted_text"],